@@ -6,7 +6,6 @@ All traffic from target devices flows through your PC
 
 import json
 import sys
-import time
 import threading
 from datetime import datetime
 from typing import List, Optional, Dict, Set, Callable
@@ -64,6 +63,7 @@ class ARPGateway:
         self.callback = callback or self._default_callback
         self.running = False
         self.spoof_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
         
         # Disable Scapy verbosity
         conf.verb = 0
@@ -234,7 +234,8 @@ class ARPGateway:
                             "error": str(e)
                         })
             
-            time.sleep(self.spoof_interval)
+            # Wakes immediately when stop() is called
+            self._stop_event.wait(self.spoof_interval)
     
     def start(self) -> bool:
         """Start ARP gateway"""
@@ -260,6 +261,7 @@ class ARPGateway:
         enable_ip_forwarding(self.interface)
         
         self.running = True
+        self._stop_event.clear()
         
         # Start spoofing thread
         self.spoof_thread = threading.Thread(target=self._spoof_loop, daemon=True)
@@ -281,6 +283,7 @@ class ARPGateway:
     def stop(self):
         """Stop ARP gateway and restore network"""
         self.running = False
+        self._stop_event.set()
         
         # Wait for spoof thread to stop
         if self.spoof_thread:
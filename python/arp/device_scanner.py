@@ -5,6 +5,7 @@ Discovers all devices on the local network
 
 import json
 import socket
+import struct
 import subprocess
 import threading
 from datetime import datetime
@@ -38,6 +39,7 @@ class DeviceScanner:
         self.interface = interface
         self.devices: Dict[str, NetworkDevice] = {}
         self.local_ip = self._get_local_ip()
+        self.local_netmask = self._get_local_netmask()
         self.local_mac = self._get_local_mac()
         self.gateway_ip = self._get_gateway_ip()
         
@@ -48,16 +50,25 @@ class DeviceScanner:
         addrs = psutil.net_if_addrs()
         if self.interface in addrs:
             for addr in addrs[self.interface]:
-                if addr.family.name == 'AF_INET':
+                if addr.family == socket.AF_INET:
                     return addr.address
         return None
     
+    def _get_local_netmask(self) -> Optional[str]:
+        """Get the netmask of the interface's IPv4 address"""
+        addrs = psutil.net_if_addrs()
+        if self.interface in addrs:
+            for addr in addrs[self.interface]:
+                if addr.family == socket.AF_INET and addr.address == self.local_ip:
+                    return addr.netmask
+        return None
+    
     def _get_local_mac(self) -> Optional[str]:
         """Get local MAC for interface"""
         addrs = psutil.net_if_addrs()
         if self.interface in addrs:
             for addr in addrs[self.interface]:
-                if addr.family.name == 'AF_LINK':
+                if addr.family == psutil.AF_LINK:
                     return addr.address.upper()
         return None
     
@@ -128,10 +139,14 @@ class DeviceScanner:
         if not self.local_ip:
             return []
         
-        # Calculate network range (assume /24)
-        parts = self.local_ip.split('.')
-        parts[3] = '0'
-        network = '.'.join(parts) + '/24'
+        # Calculate network range from the interface netmask (/24 if unknown)
+        ip_i = struct.unpack('!I', socket.inet_aton(self.local_ip))[0]
+        try:
+            mask_i = struct.unpack('!I', socket.inet_aton(self.local_netmask))[0]
+        except (TypeError, OSError):
+            mask_i = 0xFFFFFF00
+        prefix = bin(mask_i).count('1')
+        network = socket.inet_ntoa(struct.pack('!I', ip_i & mask_i)) + f'/{prefix}'
         
         # Create ARP request
         arp = ARP(pdst=network)
@@ -175,7 +190,7 @@ class DeviceScanner:
         discovered.sort(key=lambda d: (
             not d.is_gateway,
             not d.is_self,
-            [int(x) for x in d.ip.split('.')]
+            socket.inet_aton(d.ip)
         ))
         
         return discovered
@@ -335,6 +335,27 @@ class DatabaseManager:
             conn.commit()
             return True
     
+    def add_dns_queries(self, queries: List[DNSQuery]) -> int:
+        """Add a batch of DNS queries in a single transaction."""
+        with self._get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO dns_queries (
+                    id, timestamp, device_id, device_ip, query_name, query_type,
+                    response_ip, response_ttl, blocked, block_reason, category
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    query.id, query.timestamp, query.device_id, query.device_ip,
+                    query.query_name, query.query_type, query.response_ip,
+                    query.response_ttl, 1 if query.blocked else 0,
+                    query.block_reason, query.category
+                )
+                for query in queries
+            ])
+            
+            conn.commit()
+            return len(queries)
+    
     def get_dns_queries(
         self,
         device_id: Optional[str] = None,
@@ -7,11 +7,12 @@ Works without any installation on target devices
 import json
 import sys
 import threading
+import time
 from datetime import datetime
 from typing import Callable, Optional, Dict, List
 from dataclasses import dataclass, asdict
 
-from scapy.all import sniff, DNS, DNSQR, DNSRR, IP, UDP, Ether, conf
+from scapy.all import AsyncSniffer, DNS, DNSQR, DNSRR, IP, UDP, Ether, conf
 
 
 @dataclass
@@ -75,6 +76,7 @@ class DNSCapture:
         self.running = False
         self.query_count = 0
         self.capture_thread: Optional[threading.Thread] = None
+        self._sniffer: Optional[AsyncSniffer] = None
         
         # Disable Scapy verbosity
         conf.verb = 0
@@ -178,25 +180,56 @@ class DNSCapture:
             error_msg = json.dumps({"error": str(e), "type": "dns_parse_error"})
             print(error_msg, file=sys.stderr, flush=True)
     
-    def start(self):
-        """Start capturing DNS queries"""
+    def start(self, timeout: float = 5.0) -> bool:
+        """
+        Start capturing DNS queries
+        
+        Args:
+            timeout: Seconds to wait for the sniffer to open its socket
+            
+        Returns:
+            True if capture is running
+        """
         self.running = True
+        started = threading.Event()
         
-        def capture_loop():
-            try:
-                sniff(
-                    iface=self.interface,
-                    filter="udp port 53",
-                    prn=self._process_packet,
-                    store=False,
-                    stop_filter=lambda x: not self.running
-                )
-            except Exception as e:
-                error_msg = json.dumps({"error": str(e), "type": "capture_error"})
-                print(error_msg, file=sys.stderr, flush=True)
+        # AsyncSniffer can be stopped without waiting for another packet
+        self._sniffer = AsyncSniffer(
+            iface=self.interface,
+            filter="udp port 53",
+            prn=self._process_packet,
+            store=False,
+            started_callback=started.set
+        )
+        error = None
+        try:
+            self._sniffer.start()
+            self.capture_thread = self._sniffer.thread
+            
+            # Socket errors (bad interface, no Npcap, no permission) are
+            # raised in the sniffer thread, which then exits before the
+            # started callback fires
+            deadline = time.monotonic() + timeout
+            while not started.wait(0.05):
+                if not self.capture_thread.is_alive():
+                    error = getattr(self._sniffer, "exception", None) or "sniffer exited during startup"
+                    break
+                if time.monotonic() >= deadline:
+                    error = f"sniffer did not start within {timeout} seconds"
+                    break
+        except Exception as e:
+            error = e
         
-        self.capture_thread = threading.Thread(target=capture_loop, daemon=True)
-        self.capture_thread.start()
+        if error is not None:
+            self.running = False
+            if self._sniffer.running:
+                try:
+                    self._sniffer.stop(join=False)
+                except Exception:
+                    pass
+            error_msg = json.dumps({"error": str(error), "type": "capture_error"})
+            print(error_msg, file=sys.stderr, flush=True)
+            return False
         
         # Send start message
         start_msg = json.dumps({
@@ -205,10 +238,16 @@ class DNSCapture:
             "type": "dns_capture"
         })
         print(start_msg, flush=True)
+        return True
     
     def stop(self):
         """Stop capturing"""
         self.running = False
+        if self._sniffer and self._sniffer.running:
+            try:
+                self._sniffer.stop(join=False)
+            except Exception:
+                pass
         if self.capture_thread:
             self.capture_thread.join(timeout=2)
         
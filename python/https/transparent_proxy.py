@@ -10,17 +10,19 @@ Supports:
 """
 
 import asyncio
+import fnmatch
 import json
 import os
-import queue
+import re
 import signal
 import sys
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 
 # mitmproxy imports (will be available when running)
 try:
@@ -33,9 +35,68 @@ try:
 except ImportError:
     MITMPROXY_AVAILABLE = False
 
+# orjson is an optional, faster encoder for IPC output
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# RE2 guarantees linear-time matching for the combined glob matcher
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 from .traffic_parser import ParsedFlow, TrafficParser, TrafficCategory
 
 
+# Translation table that lowercases ASCII A-Z in a bytes buffer
+_ASCII_LOWER = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+
+def _lower_bytes(text: str) -> bytes:
+    """Lowercase text into UTF-8 bytes, taking the ASCII fast path when possible."""
+    try:
+        return text.encode("ascii").translate(_ASCII_LOWER)
+    except UnicodeEncodeError:
+        return text.lower().encode("utf-8")
+
+
+_GLOB_CHARS = frozenset("*?[")
+
+# Pre-encoded IPC messages; "%s" slots take an already JSON-encoded value
+_STATUS_STOPPED = b'{"type":"status","status":"stopped"}\n'
+_STATUS_SHUTTING_DOWN = b'{"type":"status","status":"shutting_down"}\n'
+_STATUS_REDIRECT_CLEANED = b'{"type":"status","status":"redirect_cleaned"}\n'
+_ADD_BLOCK_TPL = b'{"type":"config_update","action":"add_block","domain":%s}\n'
+_REMOVE_BLOCK_TPL = b'{"type":"config_update","action":"remove_block","domain":%s}\n'
+_BLOCK_CATEGORY_TPL = b'{"type":"config_update","action":"block_category","category":%s}\n'
+_UNBLOCK_CATEGORY_TPL = b'{"type":"config_update","action":"unblock_category","category":%s}\n'
+_ADD_KEYWORD_TPL = b'{"type":"config_update","action":"add_keyword","keyword":%s}\n'
+_REMOVE_KEYWORD_TPL = b'{"type":"config_update","action":"remove_keyword","keyword":%s}\n'
+
+
+def _compile_globs(patterns: List[str]):
+    """Compile glob patterns into a single alternation matched with fullmatch()."""
+    parts = []
+    for pattern in patterns:
+        regex = fnmatch.translate(pattern.lower())
+        if regex.endswith("\\Z"):
+            regex = regex[:-2]
+        parts.append(regex)
+    combined = "|".join(parts).encode("utf-8")
+    
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(combined)
+        except Exception:
+            # Constructs such as atomic groups are not supported by RE2
+            pass
+    return re.compile(combined)
+
+
 @dataclass
 class ProxyConfig:
     """Configuration for the transparent proxy."""
@@ -52,6 +113,24 @@ class ProxyConfig:
     stream_large_bodies: int = 5 * 1024 * 1024  # Stream bodies > 5MB
     anticache: bool = True
     anticomp: bool = True  # Disable compression for easier analysis
+    max_queued_events: int = 10000  # Oldest events are dropped beyond this
+    # Lowercased byte patterns derived from block_list / keyword_alerts
+    _block_patterns: Tuple[bytes, ...] = field(default=(), init=False, repr=False)
+    _block_matcher: Optional[Any] = field(default=None, init=False, repr=False)
+    _keyword_patterns: Tuple[Tuple[str, bytes], ...] = field(default=(), init=False, repr=False)
+    
+    def __post_init__(self):
+        self.compile_patterns()
+    
+    def compile_patterns(self) -> None:
+        """Rebuild the byte patterns; call after mutating block_list or keyword_alerts."""
+        plain = [p for p in self.block_list if _GLOB_CHARS.isdisjoint(p)]
+        globs = [p for p in self.block_list if not _GLOB_CHARS.isdisjoint(p)]
+        self._block_patterns = tuple(_lower_bytes(p) for p in plain)
+        self._block_matcher = _compile_globs(globs) if globs else None
+        self._keyword_patterns = tuple(
+            (k.lower(), _lower_bytes(k)) for k in self.keyword_alerts
+        )
 
 
 @dataclass 
@@ -75,7 +154,8 @@ class TrafficInterceptor:
         self,
         config: ProxyConfig,
         event_callback: Callable[[FlowEvent], None],
-        parser: Optional[TrafficParser] = None
+        parser: Optional[TrafficParser] = None,
+        ready_event: Optional[threading.Event] = None
     ):
         """
         Initialize the traffic interceptor.
@@ -84,10 +164,12 @@ class TrafficInterceptor:
             config: Proxy configuration
             event_callback: Callback for traffic events
             parser: Optional TrafficParser instance
+            ready_event: Optional event set once the proxy is listening
         """
         self.config = config
         self.event_callback = event_callback
         self.parser = parser or TrafficParser()
+        self.ready_event = ready_event
         self.active_flows: Dict[str, Dict[str, Any]] = {}
     
     def load(self, loader):
@@ -98,6 +180,31 @@ class TrafficInterceptor:
         """Called when configuration changes."""
         pass
     
+    def running(self):
+        """Called once the proxy is fully up and listening."""
+        if self.ready_event:
+            self.ready_event.set()
+    
+    def requestheaders(self, flow: http.HTTPFlow):
+        """Stream request bodies larger than the configured threshold."""
+        if self._exceeds_stream_limit(flow.request):
+            flow.request.stream = True
+    
+    def responseheaders(self, flow: http.HTTPFlow):
+        """Stream response bodies larger than the configured threshold."""
+        if self._exceeds_stream_limit(flow.response):
+            flow.response.stream = True
+    
+    def _exceeds_stream_limit(self, message) -> bool:
+        """Check the declared Content-Length against stream_large_bodies."""
+        length = message.headers.get("content-length")
+        if not length:
+            return False
+        try:
+            return int(length) > self.config.stream_large_bodies
+        except ValueError:
+            return False
+    
     def request(self, flow: http.HTTPFlow):
         """
         Called when a request is received.
@@ -108,8 +215,14 @@ class TrafficInterceptor:
         host = flow.request.host
         url = flow.request.pretty_url
         
+        # Lowercase once per flow; response() reuses these via metadata
+        host_l = _lower_bytes(host)
+        url_l = _lower_bytes(url)
+        flow.metadata["_host_l"] = host_l
+        flow.metadata["_url_l"] = url_l
+        
         # Check block list
-        if self._should_block(flow):
+        if self._should_block(host_l, url_l):
             self._block_flow(flow, "Domain blocked by policy")
             return
         
@@ -165,7 +278,10 @@ class TrafficInterceptor:
             parsed.duration_ms = duration_ms
             
             # Check for keyword alerts
-            alerts = self._check_keyword_alerts(flow)
+            url_l = flow.metadata.get("_url_l")
+            if url_l is None:
+                url_l = _lower_bytes(flow.request.pretty_url)
+            alerts = self._check_keyword_alerts(flow, url_l)
             if alerts:
                 parsed.alerts.extend(alerts)
             
@@ -209,14 +325,16 @@ class TrafficInterceptor:
             }
         ))
     
-    def _should_block(self, flow: http.HTTPFlow) -> bool:
-        """Check if flow should be blocked."""
-        host = flow.request.host.lower()
-        url = flow.request.pretty_url.lower()
+    def _should_block(self, host_l: bytes, url_l: bytes) -> bool:
+        """Check if a flow's lowercased host/URL should be blocked."""
+        for blocked in self.config._block_patterns:
+            if blocked in host_l or blocked in url_l:
+                return True
         
-        for blocked in self.config.block_list:
-            blocked = blocked.lower()
-            if blocked in host or blocked in url:
+        # Wildcard entries ("*.ads.example.com") share one compiled matcher
+        matcher = self.config._block_matcher
+        if matcher is not None:
+            if matcher.fullmatch(host_l) or matcher.fullmatch(url_l):
                 return True
         
         return False
@@ -238,44 +356,54 @@ class TrafficInterceptor:
             }
         ))
     
-    def _check_keyword_alerts(self, flow: http.HTTPFlow) -> List[str]:
+    def _check_keyword_alerts(self, flow: http.HTTPFlow, url_l: bytes) -> List[str]:
         """Check for keyword matches in request/response."""
         alerts = []
+        keywords = self.config._keyword_patterns
         
-        if not self.config.keyword_alerts:
+        if not keywords:
             return alerts
         
         # Check URL
-        url = flow.request.pretty_url.lower()
-        for keyword in self.config.keyword_alerts:
-            keyword = keyword.lower()
-            if keyword in url:
+        for keyword, pattern in keywords:
+            if pattern in url_l:
                 alerts.append(f"KEYWORD_URL:{keyword}")
         
-        # Check request body
-        if flow.request.content:
-            try:
-                content = flow.request.content.decode('utf-8', errors='ignore').lower()
-                for keyword in self.config.keyword_alerts:
-                    keyword = keyword.lower()
-                    if keyword in content:
-                        alerts.append(f"KEYWORD_REQUEST:{keyword}")
-            except Exception:
-                pass
+        # Check request body (streamed bodies are never buffered, so skip them)
+        if not flow.request.stream and flow.request.content:
+            for keyword in self._scan_body(flow.request.content, keywords):
+                alerts.append(f"KEYWORD_REQUEST:{keyword}")
         
         # Check response body
-        if flow.response and flow.response.content:
-            try:
-                content = flow.response.content.decode('utf-8', errors='ignore').lower()
-                for keyword in self.config.keyword_alerts:
-                    keyword = keyword.lower()
-                    if keyword in content:
-                        alerts.append(f"KEYWORD_RESPONSE:{keyword}")
-            except Exception:
-                pass
+        if flow.response and not flow.response.stream and flow.response.content:
+            for keyword in self._scan_body(flow.response.content, keywords):
+                alerts.append(f"KEYWORD_RESPONSE:{keyword}")
         
         return alerts
     
+    def _scan_body(
+        self,
+        content: bytes,
+        keywords: Tuple[Tuple[str, bytes], ...]
+    ) -> List[str]:
+        """Return the keywords found in a raw body (case-insensitive)."""
+        lowered = content.translate(_ASCII_LOWER)
+        text: Optional[str] = None
+        matches = []
+        
+        for keyword, pattern in keywords:
+            if pattern.isascii():
+                found = pattern in lowered
+            else:
+                # Non-ASCII keywords need full Unicode case folding
+                if text is None:
+                    text = content.decode('utf-8', errors='ignore').lower()
+                found = keyword in text
+            if found:
+                matches.append(keyword)
+        
+        return matches
+    
     def _emit_event(self, event: FlowEvent):
         """Emit event through callback."""
         if self.event_callback:
@@ -299,13 +427,31 @@ class TransparentProxy:
         """
         self.config = config or ProxyConfig()
         self.master: Optional[Master] = None
-        self.event_queue: queue.Queue = queue.Queue()
+        self.event_queue: Deque[FlowEvent] = deque(maxlen=self.config.max_queued_events)
         self.running = False
         self._proxy_thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        # Guards event_queue and the drop counters below
+        self._events_available = threading.Condition()
+        # Drops only matter once something reads events via get_events();
+        # until then stdout is the only consumer and the deque is history
+        self._has_consumer = False
+        self._events_dropped = 0
+        self._drops_reported = 0
+        self._last_drop_report = 0.0
     
     def _event_handler(self, event: FlowEvent):
         """Handle events from the interceptor."""
-        self.event_queue.put(event)
+        with self._events_available:
+            # A full deque silently evicts its oldest entry on append
+            if self._has_consumer and len(self.event_queue) == self.event_queue.maxlen:
+                self._events_dropped += 1
+            self.event_queue.append(event)
+            self._events_available.notify()
+            report = self._take_drop_report()
+        
+        if report:
+            output_json(report)
         
         # Also output to stdout for Tauri IPC
         output_json({
@@ -316,6 +462,30 @@ class TransparentProxy:
             "data": event.data
         })
     
+    def _take_drop_report(self) -> Optional[dict]:
+        """
+        Build an events_dropped message, at most once per second.
+        
+        Must be called with _events_available held; the caller writes the
+        message after releasing it.
+        """
+        if self._events_dropped == self._drops_reported:
+            return None
+        
+        now = time.monotonic()
+        if now - self._last_drop_report < 1.0:
+            return None
+        
+        total = self._events_dropped
+        report = {
+            "type": "events_dropped",
+            "count": total - self._drops_reported,
+            "total": total
+        }
+        self._drops_reported = total
+        self._last_drop_report = now
+        return report
+    
     async def _run_proxy(self):
         """Run the mitmproxy master."""
         if not MITMPROXY_AVAILABLE:
@@ -344,7 +514,8 @@ class TransparentProxy:
         # Add our interceptor addon
         interceptor = TrafficInterceptor(
             config=self.config,
-            event_callback=self._event_handler
+            event_callback=self._event_handler,
+            ready_event=self._ready
         )
         self.master.addons.add(interceptor)
         
@@ -355,11 +526,21 @@ class TransparentProxy:
         finally:
             self.running = False
     
-    def start(self):
-        """Start the proxy in a background thread."""
+    def start(self, timeout: float = 5.0):
+        """
+        Start the proxy in a background thread.
+        
+        Args:
+            timeout: Seconds to wait for the proxy to start listening
+            
+        Raises:
+            RuntimeError: If the proxy fails or does not come up in time
+        """
         if self.running:
             return
         
+        self._ready.clear()
+        
         def run_in_thread():
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
@@ -373,12 +554,17 @@ class TransparentProxy:
                 })
             finally:
                 loop.close()
+                # Unblock start() if the proxy exits before becoming ready
+                self._ready.set()
         
         self._proxy_thread = threading.Thread(target=run_in_thread, daemon=True)
         self._proxy_thread.start()
         
-        # Wait for startup
-        time.sleep(1)
+        # Wait for mitmproxy's "running" hook
+        if not self._ready.wait(timeout):
+            raise RuntimeError(f"Proxy did not start within {timeout} seconds")
+        if not self.running:
+            raise RuntimeError("Proxy exited during startup")
         
         output_json({
             "type": "status",
@@ -394,39 +580,26 @@ class TransparentProxy:
             self.master.shutdown()
         self.running = False
         
-        output_json({
-            "type": "status",
-            "status": "stopped"
-        })
+        write_json_line(_STATUS_STOPPED)
     
     def add_to_blocklist(self, domain: str):
         """Add domain to block list."""
         self.config.block_list.add(domain.lower())
-        output_json({
-            "type": "config_update",
-            "action": "add_block",
-            "domain": domain
-        })
+        self.config.compile_patterns()
+        write_json_line(_ADD_BLOCK_TPL % encode_json(domain))
     
     def remove_from_blocklist(self, domain: str):
         """Remove domain from block list."""
         self.config.block_list.discard(domain.lower())
-        output_json({
-            "type": "config_update",
-            "action": "remove_block",
-            "domain": domain
-        })
+        self.config.compile_patterns()
+        write_json_line(_REMOVE_BLOCK_TPL % encode_json(domain))
     
     def block_category(self, category: str):
         """Block a traffic category."""
         try:
             cat = TrafficCategory(category)
             self.config.category_blocks.add(cat)
-            output_json({
-                "type": "config_update",
-                "action": "block_category",
-                "category": category
-            })
+            write_json_line(_BLOCK_CATEGORY_TPL % encode_json(category))
         except ValueError:
             output_json({
                 "type": "error",
@@ -438,11 +611,7 @@ class TransparentProxy:
         try:
             cat = TrafficCategory(category)
             self.config.category_blocks.discard(cat)
-            output_json({
-                "type": "config_update",
-                "action": "unblock_category",
-                "category": category
-            })
+            write_json_line(_UNBLOCK_CATEGORY_TPL % encode_json(category))
         except ValueError:
             pass
     
@@ -450,46 +619,82 @@ class TransparentProxy:
         """Add keyword for alert detection."""
         if keyword not in self.config.keyword_alerts:
             self.config.keyword_alerts.append(keyword.lower())
-        output_json({
-            "type": "config_update",
-            "action": "add_keyword",
-            "keyword": keyword
-        })
+            self.config.compile_patterns()
+        write_json_line(_ADD_KEYWORD_TPL % encode_json(keyword))
     
     def remove_keyword_alert(self, keyword: str):
         """Remove keyword from alert detection."""
         keyword = keyword.lower()
         if keyword in self.config.keyword_alerts:
             self.config.keyword_alerts.remove(keyword)
-        output_json({
-            "type": "config_update",
-            "action": "remove_keyword",
-            "keyword": keyword
-        })
+            self.config.compile_patterns()
+        write_json_line(_REMOVE_KEYWORD_TPL % encode_json(keyword))
     
     def get_events(self, timeout: float = 0.1) -> List[FlowEvent]:
         """
         Get pending events from the queue.
         
         Args:
-            timeout: Timeout in seconds
+            timeout: Seconds to wait for the first event
             
         Returns:
             List of FlowEvent objects
         """
-        events = []
-        try:
-            while True:
-                event = self.event_queue.get(timeout=timeout)
-                events.append(event)
-        except queue.Empty:
-            pass
+        with self._events_available:
+            self._has_consumer = True
+            if not self.event_queue:
+                self._events_available.wait(timeout)
+            events = list(self.event_queue)
+            self.event_queue.clear()
+            report = self._take_drop_report()
+        
+        if report:
+            output_json(report)
         return events
 
 
+def encode_json(value: Any) -> bytes:
+    """Encode a value as compact JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def write_json_line(payload: bytes) -> None:
+    """Write a pre-encoded JSON line to stdout for Tauri IPC."""
+    # Flush the text layer first so lines written via print() stay ordered
+    sys.stdout.flush()
+    sys.stdout.buffer.write(payload)
+    sys.stdout.buffer.flush()
+
+
 def output_json(data: dict) -> None:
     """Output data as JSON to stdout for Tauri IPC."""
-    print(json.dumps(data, default=str), flush=True)
+    write_json_line(encode_json(data) + b"\n")
+
+
+def _run_netsh_script(commands: List[str], check: bool = False):
+    """
+    Run several netsh commands in a single netsh process.
+    
+    The commands are written to a temporary script and executed with
+    ``netsh -f`` so only one process has to be created.
+    """
+    import subprocess
+    import tempfile
+    
+    fd, script_path = tempfile.mkstemp(suffix=".netsh", text=True)
+    try:
+        with os.fdopen(fd, "w") as script:
+            script.write("\n".join(commands) + "\n")
+        
+        return subprocess.run(
+            ["netsh", "-f", script_path],
+            check=check,
+            capture_output=True
+        )
+    finally:
+        os.unlink(script_path)
 
 
 def setup_windows_redirect(listen_port: int = 8080) -> bool:
@@ -505,26 +710,15 @@ def setup_windows_redirect(listen_port: int = 8080) -> bool:
     import subprocess
     
     try:
-        # Enable IP forwarding
-        subprocess.run(
-            ["netsh", "interface", "ipv4", "set", "global", "forwarding=enabled"],
-            check=True,
-            capture_output=True
-        )
-        
-        # Add port proxy rule for HTTP
-        subprocess.run([
-            "netsh", "interface", "portproxy", "add", "v4tov4",
-            f"listenport=80", f"listenaddress=0.0.0.0",
-            f"connectport={listen_port}", "connectaddress=127.0.0.1"
-        ], check=True, capture_output=True)
-        
-        # Add port proxy rule for HTTPS
-        subprocess.run([
-            "netsh", "interface", "portproxy", "add", "v4tov4",
-            f"listenport=443", f"listenaddress=0.0.0.0",
-            f"connectport={listen_port}", "connectaddress=127.0.0.1"
-        ], check=True, capture_output=True)
+        _run_netsh_script([
+            # Enable IP forwarding
+            "interface ipv4 set global forwarding=enabled",
+            # Port proxy rules for HTTP and HTTPS
+            "interface portproxy add v4tov4 listenport=80 listenaddress=0.0.0.0 "
+            f"connectport={listen_port} connectaddress=127.0.0.1",
+            "interface portproxy add v4tov4 listenport=443 listenaddress=0.0.0.0 "
+            f"connectport={listen_port} connectaddress=127.0.0.1",
+        ], check=True)
         
         return True
     
@@ -538,24 +732,14 @@ def setup_windows_redirect(listen_port: int = 8080) -> bool:
 
 def cleanup_windows_redirect():
     """Clean up Windows traffic redirection rules."""
-    import subprocess
-    
     try:
         # Remove port proxy rules
-        subprocess.run([
-            "netsh", "interface", "portproxy", "delete", "v4tov4",
-            "listenport=80", "listenaddress=0.0.0.0"
-        ], capture_output=True)
-        
-        subprocess.run([
-            "netsh", "interface", "portproxy", "delete", "v4tov4",
-            "listenport=443", "listenaddress=0.0.0.0"
-        ], capture_output=True)
+        _run_netsh_script([
+            "interface portproxy delete v4tov4 listenport=80 listenaddress=0.0.0.0",
+            "interface portproxy delete v4tov4 listenport=443 listenaddress=0.0.0.0",
+        ])
         
-        output_json({
-            "type": "status",
-            "status": "redirect_cleaned"
-        })
+        write_json_line(_STATUS_REDIRECT_CLEANED)
     except Exception as e:
         output_json({
             "type": "error",
@@ -637,7 +821,7 @@ def main():
     
     # Handle signals for graceful shutdown
     def signal_handler(sig, frame):
-        output_json({"type": "status", "status": "shutting_down"})
+        write_json_line(_STATUS_SHUTTING_DOWN)
         proxy.stop()
         cleanup_windows_redirect()
         sys.exit(0)
@@ -646,7 +830,18 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
     
     if args.action == "start":
-        proxy.start()
+        try:
+            proxy.start()
+        except RuntimeError as e:
+            # Report startup failures (e.g. port in use) as JSON, not a traceback
+            if proxy.master:
+                proxy.master.shutdown()
+            output_json({
+                "type": "error",
+                "error": str(e),
+                "context": "proxy_startup"
+            })
+            sys.exit(1)
         
         # Keep running and read commands from stdin
         try:
@@ -20,14 +20,23 @@ import argparse
 import json
 import logging
 import os
+import queue
 import signal
 import sys
 import threading
 import time
+import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# orjson is an optional, faster encoder for frontend events
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -38,7 +47,7 @@ from python.utils.network_utils import get_default_interface, get_gateway_ip
 from python.stealth.device_profiles import DeviceProfileManager
 from python.stealth.mac_changer import MACChanger
 from python.stealth.hostname_changer import HostnameChanger
-from python.dns.dns_capture import DNSCapture
+from python.dns.dns_capture import DNSCapture, DNSQuery as CapturedDNSQuery
 from python.dns.dns_blocker import DNSBlocker
 from python.arp.arp_gateway import ARPGateway
 from python.arp.device_scanner import DeviceScanner
@@ -49,11 +58,45 @@ from python.blocking.blocker import UnifiedBlocker
 from python.alerts.alert_engine import AlertEngine
 from python.alerts.notifier import Notifier
 from python.database.db_manager import DatabaseManager
+from python.database.models import DNSQuery
+
+
+def _encode_json(value) -> bytes:
+    """Encode a value as compact JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+# Pre-encoded '{"type":...,"timestamp":' prefixes for the common event types
+_EVENT_PREFIXES = {
+    event_type: b'{"type":"%s","timestamp":' % event_type.encode()
+    for event_type in (
+        "dns", "traffic", "device", "alert", "status", "error", "started", "stopped"
+    )
+}
+
+
+def _encode_event(event_type: str, timestamp: str, data: dict) -> bytes:
+    """Encode a frontend event as a single JSON object (no trailing newline)."""
+    prefix = _EVENT_PREFIXES.get(event_type)
+    if prefix is None:
+        prefix = b'{"type":' + _encode_json(event_type) + b',"timestamp":'
+    return prefix + _encode_json(timestamp) + b',"data":' + _encode_json(data) + b"}"
 
 
 class NetworkMonitor:
     """Main Network Monitor orchestrator."""
 
+    # Events emitted within this window (or up to this many bytes) share one write
+    EMIT_BATCH_WINDOW = 0.010
+    EMIT_BATCH_BYTES = 16 * 1024
+
+    # Captured DNS packets are buffered and stored in batches
+    DNS_QUEUE_SIZE = 10000
+    DNS_BATCH_SIZE = 500
+    DNS_BATCH_WINDOW = 0.020
+
     def __init__(self, config_path: Optional[str] = None):
         """Initialize the Network Monitor.
         
@@ -65,6 +108,7 @@ class NetworkMonitor:
         
         # Load configuration
         self.config = ConfigManager(self.config_path)
+        self._load_settings()
         
         # Initialize components (lazy loading)
         self._db: Optional[DatabaseManager] = None
@@ -85,8 +129,27 @@ class NetworkMonitor:
         self.is_running = False
         self.start_time: Optional[datetime] = None
         self._threads: list[threading.Thread] = []
+        self._dns_writer: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         
+        # Frontend events are serialized and written by a dedicated thread
+        self._out = sys.stdout.buffer
+        self._stdout_lock = threading.Lock()
+        self._emit_q: queue.SimpleQueue = queue.SimpleQueue()
+        self._emit_writer = threading.Thread(
+            target=self._emit_writer_loop,
+            name="EmitWriter",
+            daemon=True
+        )
+        self._emit_writer.start()
+        
+        # DNS packets from the capture thread, drained by the DNS writer
+        self._dns_ingest_q: queue.Queue = queue.Queue(maxsize=self.DNS_QUEUE_SIZE)
+        self._dns_dropped = 0
+        
+        # (epoch second, ISO prefix) reused by _timestamp() within a second
+        self._ts_cache = (0, "")
+        
         # Network info
         self.interface: Optional[str] = None
         self.gateway_ip: Optional[str] = None
@@ -128,12 +191,81 @@ class NetworkMonitor:
             event_type: Type of event (traffic, alert, device, status, error)
             data: Event data dictionary
         """
-        event = {
-            "type": event_type,
-            "timestamp": datetime.now().isoformat(),
-            "data": data
-        }
-        print(json.dumps(event), flush=True)
+        event = (event_type, self._timestamp(), data)
+        if self._emit_writer.is_alive():
+            self._emit_q.put(event)
+        else:
+            payload = _encode_event(*event) + b"\n"
+            with self._stdout_lock:
+                self._out.write(payload)
+                self._out.flush()
+
+    def _timestamp(self) -> str:
+        """Local ISO-8601 timestamp with microseconds.
+        
+        The "YYYY-MM-DDTHH:MM:SS" part is formatted once per second and
+        only the fractional suffix is rendered per call.
+        """
+        now = time.time()
+        second = int(now)
+        cached_second, prefix = self._ts_cache
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second).isoformat()
+            self._ts_cache = (second, prefix)
+        return f"{prefix}.{int((now - second) * 1_000_000):06d}"
+
+    def _emit_writer_loop(self) -> None:
+        """Coalesce queued events into batched stdout writes.
+        
+        Each event is still written as one JSON line; a batch is flushed
+        after EMIT_BATCH_WINDOW seconds or EMIT_BATCH_BYTES of output.
+        A None sentinel flushes the pending batch and ends the loop.
+        """
+        buf = bytearray()
+        while True:
+            event = self._emit_q.get()
+            if event is None:
+                return
+                
+            buf.clear()
+            self._encode_into(buf, event)
+            deadline = time.monotonic() + self.EMIT_BATCH_WINDOW
+            done = False
+            
+            while len(buf) < self.EMIT_BATCH_BYTES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = self._emit_q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if event is None:
+                    done = True
+                    break
+                self._encode_into(buf, event)
+                
+            if buf:
+                with self._stdout_lock:
+                    self._out.write(buf)
+                    self._out.flush()
+            if done:
+                return
+
+    def _encode_into(self, buf: bytearray, event: tuple) -> None:
+        """Append one encoded event line to buf, skipping unencodable events."""
+        try:
+            buf += _encode_event(*event)
+        except Exception as e:
+            self.logger.error(f"Dropped unencodable {event[0]!r} event: {e}")
+            return
+        buf += b"\n"
+
+    def _close_emitter(self) -> None:
+        """Flush pending events and stop the writer thread."""
+        if self._emit_writer.is_alive():
+            self._emit_q.put(None)
+            self._emit_writer.join(timeout=1)
 
     def emit_status(self, message: str, level: str = "info") -> None:
         """Emit a status update."""
@@ -144,6 +276,22 @@ class NetworkMonitor:
         self.emit("error", {"error": error, "component": component})
         self.logger.error(f"[{component}] {error}")
 
+    def _load_settings(self) -> None:
+        """Resolve the settings used by the start-up path into attributes.
+        
+        Called from __init__ so the setup methods can be used on their own,
+        and again from start() for a fresh read; the setup methods read
+        plain attributes instead of repeating dotted-key lookups.
+        """
+        get = self.config.get
+        self._cfg_interface: str = get("network.interface", "auto")
+        self._cfg_gateway_ip: str = get("network.gateway_ip", "auto")
+        self._cfg_stealth_enabled: bool = get("stealth.enabled", True)
+        self._cfg_device_profile: str = get("stealth.device_profile", "hp_printer")
+        self._cfg_change_mac: bool = get("stealth.change_mac", True)
+        self._cfg_change_hostname: bool = get("stealth.change_hostname", True)
+        self._cfg_proxy_port: int = get("proxy.listen_port", 8080)
+
     def setup_network(self) -> bool:
         """Detect and configure network settings.
         
@@ -152,7 +300,7 @@ class NetworkMonitor:
         """
         try:
             # Get network interface
-            interface_config = self.config.get("network.interface", "auto")
+            interface_config = self._cfg_interface
             if interface_config == "auto":
                 self.interface = get_default_interface()
             else:
@@ -163,7 +311,7 @@ class NetworkMonitor:
                 return False
                 
             # Get gateway IP
-            gateway_config = self.config.get("network.gateway_ip", "auto")
+            gateway_config = self._cfg_gateway_ip
             if gateway_config == "auto":
                 self.gateway_ip = get_gateway_ip()
             else:
@@ -186,7 +334,7 @@ class NetworkMonitor:
         Returns:
             True if successful, False otherwise
         """
-        if not self.config.get("stealth.enabled", True):
+        if not self._cfg_stealth_enabled:
             self.emit_status("Stealth mode disabled", "warning")
             return True
             
@@ -195,7 +343,7 @@ class NetworkMonitor:
             self._profile_manager = DeviceProfileManager()
             
             # Get current profile
-            profile_id = self.config.get("stealth.device_profile", "hp_printer")
+            profile_id = self._cfg_device_profile
             profile = self._profile_manager.get_profile(profile_id)
             
             if not profile:
@@ -203,7 +351,7 @@ class NetworkMonitor:
                 return False
                 
             # Change MAC address
-            if self.config.get("stealth.change_mac", True):
+            if self._cfg_change_mac:
                 self._mac_changer = MACChanger()
                 new_mac = self._profile_manager.generate_mac(profile_id)
                 if self._mac_changer.change_mac(self.interface, new_mac):
@@ -212,7 +360,7 @@ class NetworkMonitor:
                     self.emit_error("Failed to change MAC address")
                     
             # Change hostname
-            if self.config.get("stealth.change_hostname", True):
+            if self._cfg_change_hostname:
                 self._hostname_changer = HostnameChanger()
                 hostname = profile.get("hostname", "Device")
                 if self._hostname_changer.change_hostname(hostname):
@@ -240,13 +388,19 @@ class NetworkMonitor:
                 blocker=self._dns_blocker
             )
             
-            thread = threading.Thread(
-                target=self._dns_capture.start,
-                name="DNSCapture",
+            # Packets captured before the writer starts wait in the queue
+            if not self._dns_capture.start():
+                self.emit_error("DNS capture failed to start", "dns")
+                return False
+                
+            writer = threading.Thread(
+                target=self._dns_writer_loop,
+                name="DNSWriter",
                 daemon=True
             )
-            thread.start()
-            self._threads.append(thread)
+            writer.start()
+            self._threads.append(writer)
+            self._dns_writer = writer
             
             self.emit_status("DNS capture started")
             return True
@@ -301,7 +455,7 @@ class NetworkMonitor:
             True if successful, False otherwise
         """
         try:
-            port = self.config.get("proxy.listen_port", 8080)
+            port = self._cfg_proxy_port
             cert_path = PROJECT_ROOT / "certs"
             
             # Ensure certificate exists
@@ -334,27 +488,105 @@ class NetworkMonitor:
             self.emit_error(f"HTTPS proxy failed: {e}", "https")
             return False
 
-    def _on_dns_packet(self, packet_data: dict) -> None:
+    def _on_dns_packet(self, packet_data: CapturedDNSQuery) -> None:
         """Handle captured DNS packet.
         
+        Runs on the capture thread, so it only queues the packet; storage,
+        alerting and emitting happen on the DNS writer thread.
+        
         Args:
-            packet_data: Parsed DNS packet data
+            packet_data: DNS query from the capture engine
         """
         try:
-            # Store in database
-            self.db.insert_dns_query(packet_data)
-            
-            # Check for alerts
-            alert = self.alert_engine.check_dns(packet_data)
-            if alert:
-                self.notifier.notify(alert)
-                self.emit("alert", alert)
+            self._dns_ingest_q.put_nowait(packet_data)
+        except queue.Full:
+            self._dns_dropped += 1
+
+    def _dns_writer_loop(self) -> None:
+        """Drain queued DNS packets in batches until a None sentinel arrives."""
+        while True:
+            packet_data = self._dns_ingest_q.get()
+            if packet_data is None:
+                return
                 
-            # Emit to frontend
-            self.emit("dns", packet_data)
+            batch = [packet_data]
+            deadline = time.monotonic() + self.DNS_BATCH_WINDOW
+            done = False
+            
+            while len(batch) < self.DNS_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    packet_data = self._dns_ingest_q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if packet_data is None:
+                    done = True
+                    break
+                batch.append(packet_data)
+                
+            self._process_dns_batch(batch)
+            if done:
+                return
+
+    def _to_dns_record(
+        self, packet_data: CapturedDNSQuery, device_ids: dict
+    ) -> DNSQuery:
+        """Convert a captured DNS query into a database record.
+        
+        Args:
+            packet_data: DNS query from the capture engine
+            device_ids: MAC -> device id lookups already done for this batch
+        """
+        mac = packet_data.device_mac
+        if mac and mac not in device_ids:
+            device = self.db.get_device_by_mac(mac)
+            device_ids[mac] = device.id if device else None
+            
+        return DNSQuery(
+            # Capture ids restart at 1 each run, so they can't be the key
+            id=uuid.uuid4().hex,
+            timestamp=packet_data.timestamp,
+            device_id=device_ids.get(mac),
+            device_ip=packet_data.device_ip,
+            query_name=packet_data.query_name,
+            query_type=packet_data.query_type,
+            response_ip=packet_data.response_ip,
+            response_ttl=packet_data.ttl,
+            blocked=packet_data.blocked
+        )
+
+    def _process_dns_batch(self, batch: list) -> None:
+        """Store a batch of DNS packets, then alert on and emit each one."""
+        try:
+            # Store in database (one transaction for the whole batch)
+            device_ids = {}
+            self.db.add_dns_queries(
+                [self._to_dns_record(packet_data, device_ids) for packet_data in batch]
+            )
+        except Exception as e:
+            self.logger.error(f"DNS batch insert error: {e}")
             
+        # AlertEngine has no DNS entry point yet; only alert if one exists
+        try:
+            check_dns = getattr(self.alert_engine, "check_dns", None)
         except Exception as e:
-            self.logger.error(f"DNS packet handling error: {e}")
+            self.logger.error(f"Alert engine unavailable: {e}")
+            check_dns = None
+            
+        for packet_data in batch:
+            if check_dns:
+                try:
+                    alert = check_dns(packet_data)
+                    if alert:
+                        self.notifier.notify(alert)
+                        self.emit("alert", alert)
+                except Exception as e:
+                    self.logger.error(f"DNS alert check error: {e}")
+                    
+            # Emit to frontend, whether or not alerting succeeded
+            self.emit("dns", packet_data.to_dict())
 
     def _on_http_flow(self, flow_data: dict) -> None:
         """Handle captured HTTP/HTTPS flow.
@@ -421,6 +653,7 @@ class NetworkMonitor:
         Returns:
             True if started successfully
         """
+        self._load_settings()
         self.logger.info(f"Starting Network Monitor in {mode} mode")
         self.emit_status(f"Starting Network Monitor ({mode} mode)")
         
@@ -465,9 +698,18 @@ class NetworkMonitor:
         
         self._stop_event.set()
         
+        # Shutdown waits (DNS sentinel, thread joins) share one 5s deadline
+        deadline = time.monotonic() + 5
+        
         # Stop components
         if self._dns_capture:
             self._dns_capture.stop()
+            try:
+                self._dns_ingest_q.put(None, timeout=max(0, deadline - time.monotonic()))
+            except queue.Full:
+                pass
+            if self._dns_dropped:
+                self.logger.warning(f"Dropped {self._dns_dropped} DNS packets (queue full)")
             
         if self._arp_gateway:
             self._arp_gateway.stop()
@@ -479,17 +721,21 @@ class NetworkMonitor:
         if self._ip_forwarding:
             self._ip_forwarding.disable()
             
-        # Wait for threads
+        # Wait for threads against the shared deadline, not 5s each
         for thread in self._threads:
-            thread.join(timeout=5)
+            thread.join(timeout=max(0, deadline - time.monotonic()))
             
-        # Close database
-        if self._db:
+        # Close database, unless the DNS writer missed the deadline and may
+        # still be inserting a batch
+        if self._dns_writer and self._dns_writer.is_alive():
+            self.logger.warning("DNS writer still running; leaving database open")
+        elif self._db:
             self._db.close()
             
         self.is_running = False
         self.emit_status("Network Monitor stopped")
         self.emit("stopped", {})
+        self._close_emitter()
 
     def run(self, mode: str = "full") -> None:
         """Run the Network Monitor until interrupted.
@@ -497,23 +743,32 @@ class NetworkMonitor:
         Args:
             mode: Operating mode
         """
-        # Setup signal handlers
+        received = []
+        
+        # Setup signal handlers; they only flag the stop and cleanup
+        # happens below, outside the signal frame. They run on the main
+        # thread between the timed waits below, which is what lets them
+        # fire on Windows.
         def signal_handler(sig, frame):
-            self.logger.info(f"Received signal {sig}")
-            self.stop()
-            sys.exit(0)
+            received.append(sig)
+            self._stop_event.set()
             
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
         # Start monitoring
         if not self.start(mode):
+            self._close_emitter()
             sys.exit(1)
             
-        # Keep running
+        # Block until stop() or a signal sets the stop event. The wait is
+        # timed: on Windows an untimed wait can't be interrupted, so Ctrl+C
+        # would never reach the signal handler.
         try:
-            while self.is_running and not self._stop_event.is_set():
-                time.sleep(1)
+            while not self._stop_event.wait(1.0):
+                pass
+            if received:
+                self.logger.info(f"Received signal {received[0]}")
         except KeyboardInterrupt:
             pass
         finally:
@@ -4,30 +4,72 @@ Each profile makes your PC appear as a different device type
 """
 
 import json
+import os
 import random
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from dataclasses import dataclass, asdict
 
 
-@dataclass
+@dataclass(frozen=True)
 class DeviceProfile:
     """Represents a fake device identity"""
+    # Explicit slots (rather than slots=True) keep Python 3.9 support
+    __slots__ = ('id', 'name', 'mac_prefix', 'hostname', 'description',
+                 '_prefix_upper', '_suffix_len', '_dict')
+    
     id: str
     name: str
     mac_prefix: str
     hostname: str
     description: str
     
+    def __post_init__(self):
+        # Split the prefix once; generate_mac only has to add the suffix
+        prefix_parts = self.mac_prefix.split(':')
+        object.__setattr__(self, '_prefix_upper', ':'.join(prefix_parts).upper())
+        object.__setattr__(self, '_suffix_len', 6 - len(prefix_parts))
+        object.__setattr__(self, '_dict', None)
+    
     def generate_mac(self) -> str:
         """Generate a full MAC address with this profile's prefix"""
-        prefix_parts = self.mac_prefix.split(':')
         # Generate random suffix
-        suffix = [format(random.randint(0, 255), '02x') for _ in range(6 - len(prefix_parts))]
-        return ':'.join(prefix_parts + suffix).upper()
+        suffix = os.urandom(self._suffix_len).hex().upper()
+        parts = [self._prefix_upper]
+        parts.extend(suffix[i:i + 2] for i in range(0, len(suffix), 2))
+        return ':'.join(parts)
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Profiles are immutable, so the asdict() result can be memoized;
+        # callers get a shallow copy they are free to modify
+        if self._dict is None:
+            object.__setattr__(self, '_dict', asdict(self))
+        return dict(self._dict)
+    
+    def __reduce__(self):
+        # Frozen + __slots__ needs an explicit recipe for copy/pickle
+        return (DeviceProfile, (self.id, self.name, self.mac_prefix,
+                                self.hostname, self.description))
+
+
+def mac_to_oui(mac: Union[str, bytes]) -> Optional[int]:
+    """
+    Get the 24-bit OUI of a MAC address as an integer
+    
+    Accepts raw address bytes or text such as "AA:BB:CC", "aa-bb-cc-dd-ee-ff".
+    """
+    if isinstance(mac, (bytes, bytearray)):
+        if len(mac) < 3:
+            return None
+        return (mac[0] << 16) | (mac[1] << 8) | mac[2]
+    
+    octets = mac.replace('-', ':').split(':')
+    if len(octets) < 3:
+        return None
+    try:
+        return int(''.join(octets[:3]), 16)
+    except ValueError:
+        return None
 
 
 # Built-in device profiles
@@ -105,11 +147,18 @@ DEFAULT_PROFILES = [
 ]
 
 
+_DEFAULT_IDS = frozenset(p.id for p in DEFAULT_PROFILES)
+
+
 class DeviceProfiles:
     """Manage device profiles for MAC spoofing"""
     
     def __init__(self, config_path: Optional[Path] = None):
         self.profiles: List[DeviceProfile] = list(DEFAULT_PROFILES)
+        self._by_id: Dict[str, DeviceProfile] = {}
+        self._by_oui: Dict[int, DeviceProfile] = {}
+        for p in self.profiles:
+            self._index(p)
         self.config_path = config_path or Path(__file__).parent.parent.parent / "config" / "device_profiles.json"
         self.current_profile: Optional[DeviceProfile] = None
         self._load_custom_profiles()
@@ -123,7 +172,9 @@ class DeviceProfiles:
                     
                 # Add custom profiles
                 for p in data.get('custom_profiles', []):
-                    self.profiles.append(DeviceProfile(**p))
+                    profile = DeviceProfile(**p)
+                    self.profiles.append(profile)
+                    self._index(profile)
                 
                 # Set current profile if saved
                 current_id = data.get('current_profile')
@@ -133,6 +184,13 @@ class DeviceProfiles:
             except (json.JSONDecodeError, IOError):
                 pass
     
+    def _index(self, profile: DeviceProfile):
+        """Add a profile to the id and OUI lookup tables"""
+        self._by_id.setdefault(profile.id, profile)
+        oui = mac_to_oui(profile.mac_prefix)
+        if oui is not None:
+            self._by_oui.setdefault(oui, profile)
+    
     def save_config(self):
         """Save current configuration"""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
@@ -141,7 +199,7 @@ class DeviceProfiles:
             "profiles": [p.to_dict() for p in DEFAULT_PROFILES],
             "custom_profiles": [
                 p.to_dict() for p in self.profiles 
-                if p not in DEFAULT_PROFILES
+                if p.id not in _DEFAULT_IDS
             ],
             "current_profile": self.current_profile.id if self.current_profile else None,
             "auto_rotate": False,
@@ -157,10 +215,11 @@ class DeviceProfiles:
     
     def get_by_id(self, profile_id: str) -> Optional[DeviceProfile]:
         """Get profile by ID"""
-        for p in self.profiles:
-            if p.id == profile_id:
-                return p
-        return None
+        return self._by_id.get(profile_id)
+    
+    def get_by_mac(self, mac: Union[str, bytes]) -> Optional[DeviceProfile]:
+        """Get the profile whose vendor prefix (OUI) matches a MAC address"""
+        return self._by_oui.get(mac_to_oui(mac))
     
     def get_random(self) -> DeviceProfile:
         """Get a random profile"""
@@ -169,6 +228,7 @@ class DeviceProfiles:
     def add_custom(self, profile: DeviceProfile):
         """Add a custom profile"""
         self.profiles.append(profile)
+        self._index(profile)
         self.save_config()
     
     def set_current(self, profile: DeviceProfile):
@@ -177,11 +237,27 @@ class DeviceProfiles:
         self.save_config()
 
 
+_shared_profiles: Optional[DeviceProfiles] = None
+
+
+def _get_shared_profiles() -> DeviceProfiles:
+    """Get the lazily created DeviceProfiles shared by the module helpers"""
+    global _shared_profiles
+    if _shared_profiles is None:
+        _shared_profiles = DeviceProfiles()
+    return _shared_profiles
+
+
 def get_random_profile() -> DeviceProfile:
     """Quick function to get a random device profile"""
-    return DeviceProfiles().get_random()
+    return _get_shared_profiles().get_random()
+
+
+def get_all_profiles() -> List[DeviceProfile]:
+    """Quick function to list all device profiles"""
+    return _get_shared_profiles().get_all()
 
 
 def get_profile_by_id(profile_id: str) -> Optional[DeviceProfile]:
     """Get a specific profile by ID"""
-    return DeviceProfiles().get_by_id(profile_id)
+    return _get_shared_profiles().get_by_id(profile_id)
@@ -3,12 +3,15 @@ Hostname Changer for Windows
 Changes the computer's hostname to match the spoofed device profile
 """
 
-import subprocess
 import socket
 import winreg
 from typing import Optional, Tuple
 
 
+# Bytes allowed in a NetBIOS name (letters, digits, hyphen)
+_NETBIOS_CHARS = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-'
+
+
 def get_hostname() -> str:
     """Get current computer hostname"""
     return socket.gethostname()
@@ -31,54 +34,51 @@ def change_hostname(new_hostname: str) -> Tuple[bool, str]:
     if len(new_hostname) > 15:
         new_hostname = new_hostname[:15]
     
+    # Deleting the valid bytes leaves anything invalid behind
+    encoded = new_hostname.encode('ascii', 'replace')
+    if not encoded or encoded.translate(None, _NETBIOS_CHARS):
+        return False, f"Invalid hostname '{new_hostname}': use letters, digits and hyphens only"
+    
     try:
-        # Method 1: Using WMIC (older but widely compatible)
-        result = subprocess.run(
-            ['wmic', 'computersystem', 'where', 'name="%COMPUTERNAME%"', 
-             'call', 'rename', f'name="{new_hostname}"'],
-            capture_output=True,
-            text=True,
-            shell=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
-        )
+        # Method 1: Registry modification (no process spawn; takes effect after restart)
+        # Open the parent once and reach both children relative to its handle
+        parent_path = r"SYSTEM\CurrentControlSet\Control\ComputerName"
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, parent_path, 0, winreg.KEY_WRITE) as parent:
+            with winreg.OpenKey(parent, "ComputerName", 0, winreg.KEY_SET_VALUE) as key:
+                winreg.SetValueEx(key, "ComputerName", 0, winreg.REG_SZ, new_hostname)
+            
+            # Also set ActiveComputerName
+            with winreg.OpenKey(parent, "ActiveComputerName", 0, winreg.KEY_SET_VALUE) as key:
+                winreg.SetValueEx(key, "ComputerName", 0, winreg.REG_SZ, new_hostname)
+            
+            # Persist both writes with a single flush
+            winreg.FlushKey(parent)
         
-        if result.returncode == 0:
-            return True, f"Hostname change initiated to '{new_hostname}'. May require restart for full effect."
+        return True, f"Hostname set to '{new_hostname}' in registry. Restart required."
         
     except Exception as e:
-        pass
+        registry_error = e
     
     try:
-        # Method 2: Using PowerShell (modern)
-        ps_command = f'Rename-Computer -NewName "{new_hostname}" -Force -ErrorAction SilentlyContinue'
-        result = subprocess.run(
-            ['powershell', '-Command', ps_command],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW
+        # Method 2: Using PowerShell (only when the registry write failed).
+        # Imported here so the script still runs standalone
+        try:
+            from . import ps_host
+        except ImportError:
+            import ps_host
+        
+        ok, _ = ps_host.run(
+            f"Rename-Computer -NewName {ps_host.quote(new_hostname)} -Force",
+            timeout=5
         )
         
-        if result.returncode == 0:
+        if ok:
             return True, f"Hostname changed to '{new_hostname}'. Restart required for full effect."
             
-    except Exception as e:
+    except Exception:
         pass
     
-    try:
-        # Method 3: Registry modification (takes effect after restart)
-        key_path = r"SYSTEM\CurrentControlSet\Control\ComputerName\ComputerName"
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path, 0, winreg.KEY_SET_VALUE) as key:
-            winreg.SetValueEx(key, "ComputerName", 0, winreg.REG_SZ, new_hostname)
-        
-        # Also set ActiveComputerName
-        active_key_path = r"SYSTEM\CurrentControlSet\Control\ComputerName\ActiveComputerName"
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, active_key_path, 0, winreg.KEY_SET_VALUE) as key:
-            winreg.SetValueEx(key, "ComputerName", 0, winreg.REG_SZ, new_hostname)
-        
-        return True, f"Hostname set to '{new_hostname}' in registry. Restart required."
-        
-    except Exception as e:
-        return False, f"Failed to change hostname: {e}"
+    return False, f"Failed to change hostname: {registry_error}"
 
 
 def get_netbios_name() -> Optional[str]:
@@ -3,24 +3,124 @@ MAC Address Changer for Windows
 Changes the MAC address of a network interface to disguise the device
 """
 
+import ctypes
+import shutil
 import subprocess
+import threading
 import winreg
 import re
 import time
 import json
 import sys
+from ctypes import wintypes
 from typing import Optional, Dict, Tuple
 from pathlib import Path
 
-from .device_profiles import DeviceProfile, DeviceProfiles, get_random_profile
+import psutil
+
+from . import ps_host
+from .device_profiles import (
+    DeviceProfile, get_all_profiles, get_profile_by_id, get_random_profile
+)
+from ..utils.network_utils import get_adapter_guid
+
+
+_MAC_VALIDATE_RE = re.compile(r'^([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}$')
+
+# `getmac /v /fo csv` rows: "Connection Name","Adapter","Physical Address",...
+_GETMAC_ROW_RE = re.compile(
+    r'^"(?P<name>[^"]*)",[^\n]*?(?P<mac>([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2})',
+    re.MULTILINE
+)
+
+
+class VALENTW(ctypes.Structure):
+    _fields_ = [
+        ("ve_valuename", wintypes.LPWSTR),
+        ("ve_valuelen", wintypes.DWORD),
+        ("ve_valueptr", ctypes.c_size_t),
+        ("ve_type", wintypes.DWORD),
+    ]
+
+
+_advapi32 = ctypes.WinDLL("advapi32")
+_advapi32.RegQueryMultipleValuesW.argtypes = [
+    wintypes.HKEY, ctypes.POINTER(VALENTW), wintypes.DWORD,
+    ctypes.c_void_p, ctypes.POINTER(wintypes.DWORD)
+]
+_advapi32.RegQueryMultipleValuesW.restype = wintypes.LONG
+
+ERROR_MORE_DATA = 234
+
+# Interface change notifications (see _wait_iface_state)
+_IF_CHANGE_CALLBACK = ctypes.WINFUNCTYPE(None, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int)
+
+_iphlpapi = ctypes.WinDLL("iphlpapi")
+_iphlpapi.NotifyIpInterfaceChange.argtypes = [
+    ctypes.c_ushort, _IF_CHANGE_CALLBACK, ctypes.c_void_p,
+    wintypes.BOOLEAN, ctypes.POINTER(wintypes.HANDLE)
+]
+_iphlpapi.NotifyIpInterfaceChange.restype = wintypes.ULONG
+_iphlpapi.CancelMibChangeNotify2.argtypes = [wintypes.HANDLE]
+_iphlpapi.CancelMibChangeNotify2.restype = wintypes.ULONG
+
+AF_UNSPEC = 0
+
+# Values read from each adapter Class subkey
+_ADAPTER_VALUES = ("DriverDesc", "NetCfgInstanceId")
+
+
+def _query_adapter_values(key) -> Optional[Tuple[str, str]]:
+    """
+    Read DriverDesc and NetCfgInstanceId with one RegQueryMultipleValuesW call
+    
+    Returns:
+        (driver_desc, net_cfg_instance_id), or None if either is missing
+        or not a REG_SZ
+    """
+    entries = (VALENTW * len(_ADAPTER_VALUES))(*(VALENTW(name) for name in _ADAPTER_VALUES))
+    size = wintypes.DWORD(512)
+    for _ in range(2):
+        buf = ctypes.create_string_buffer(size.value)
+        ret = _advapi32.RegQueryMultipleValuesW(
+            key.handle, entries, len(entries), buf, ctypes.byref(size)
+        )
+        if ret != ERROR_MORE_DATA:
+            break
+    if ret != 0:
+        return None
+    
+    values = []
+    for entry in entries:
+        if entry.ve_type != winreg.REG_SZ:
+            return None
+        values.append(ctypes.wstring_at(entry.ve_valueptr, entry.ve_valuelen // 2).rstrip('\0'))
+    return values[0], values[1]
+
+
+# Adapter registry key per interface name (lowercased), shared by all
+# MACChanger instances so the Class subkey walk runs once per adapter
+_ADAPTER_KEY_CACHE: Dict[str, str] = {}
+
+
+def invalidate_adapter_cache(interface: Optional[str] = None):
+    """Forget cached adapter registry keys (all, or one interface's)"""
+    if interface is None:
+        _ADAPTER_KEY_CACHE.clear()
+    else:
+        _ADAPTER_KEY_CACHE.pop(interface.lower(), None)
 
 
 class MACChanger:
     """
     Windows MAC Address Changer
-    Uses registry modification and netsh to change MAC address
+    Uses Set-NetAdapter when PowerShell is available, otherwise registry
+    modification and netsh to change MAC address
     """
     
+    # Whether powershell.exe is on PATH; resolved once per process
+    _powershell_available: Optional[bool] = None
+    
     def __init__(self, interface: str):
         """
         Initialize MAC changer for specific interface
@@ -38,6 +138,17 @@ class MACChanger:
         if self._adapter_key:
             return self._adapter_key
         
+        cached = _ADAPTER_KEY_CACHE.get(self.interface.lower())
+        if cached:
+            self._adapter_key = cached
+            return cached
+        
+        # Match on the adapter GUID when it can be resolved; it is exact and
+        # cheaper to compare than a substring search of DriverDesc
+        guid = get_adapter_guid(self.interface)
+        if guid:
+            guid = guid.lower()
+        
         try:
             # Search in network adapter configurations
             reg_path = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e972-e325-11ce-bfc1-08002be10318}"
@@ -47,22 +158,31 @@ class MACChanger:
                 while True:
                     try:
                         subkey_name = winreg.EnumKey(key, i)
-                        subkey_path = f"{reg_path}\\{subkey_name}"
-                        
-                        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, subkey_path) as subkey:
-                            try:
-                                driver_desc = winreg.QueryValueEx(subkey, "DriverDesc")[0]
-                                net_cfg_id = winreg.QueryValueEx(subkey, "NetCfgInstanceId")[0]
-                                
-                                # Check if this matches our interface
-                                if self.interface.lower() in driver_desc.lower():
-                                    self._adapter_key = subkey_path
-                                    return subkey_path
-                            except WindowsError:
-                                pass
-                        i += 1
                     except WindowsError:
                         break
+                    i += 1
+                    
+                    try:
+                        with winreg.OpenKey(key, subkey_name) as subkey:
+                            values = _query_adapter_values(subkey)
+                    except WindowsError:
+                        # e.g. the access-restricted "Properties" subkey
+                        continue
+                    if not values:
+                        continue
+                    
+                    driver_desc, net_cfg_id = values
+                    if guid:
+                        matched = net_cfg_id.lower() == guid
+                    else:
+                        matched = self.interface.lower() in driver_desc.lower()
+                    
+                    # Check if this matches our interface
+                    if matched:
+                        subkey_path = f"{reg_path}\\{subkey_name}"
+                        self._adapter_key = subkey_path
+                        _ADAPTER_KEY_CACHE[self.interface.lower()] = subkey_path
+                        return subkey_path
         except Exception as e:
             print(f"Error finding adapter registry key: {e}")
         
@@ -70,72 +190,121 @@ class MACChanger:
     
     def get_current_mac(self) -> Optional[str]:
         """Get current MAC address of the interface"""
-        try:
-            result = subprocess.run(
-                ['getmac', '/v', '/fo', 'csv'],
-                capture_output=True,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            
-            for line in result.stdout.split('\n'):
-                if self.interface in line:
-                    # Extract MAC from CSV
-                    parts = line.split(',')
-                    for part in parts:
-                        mac_match = re.search(r'([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}', part)
-                        if mac_match:
-                            return mac_match.group(0).replace('-', ':').upper()
-        except Exception:
-            pass
+        for addr in psutil.net_if_addrs().get(self.interface, []):
+            if addr.family == psutil.AF_LINK and addr.address:
+                return addr.address.replace('-', ':').upper()
         
-        # Alternative method using ipconfig
+        # Fallback: getmac
         try:
             result = subprocess.run(
-                ['ipconfig', '/all'],
+                ['getmac', '/v', '/fo', 'csv'],
                 capture_output=True,
                 text=True,
                 creationflags=subprocess.CREATE_NO_WINDOW
             )
             
-            in_interface = False
-            for line in result.stdout.split('\n'):
-                if self.interface in line:
-                    in_interface = True
-                elif in_interface and 'Physical Address' in line:
-                    mac_match = re.search(r'([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}', line)
-                    if mac_match:
-                        return mac_match.group(0).replace('-', ':').upper()
-                elif in_interface and line.strip() == '':
-                    in_interface = False
+            for match in _GETMAC_ROW_RE.finditer(result.stdout):
+                if match.group('name') == self.interface:
+                    return match.group('mac').replace('-', ':').upper()
         except Exception:
             pass
         
         return None
     
+    def _wait_iface_state(self, want_up: bool, timeout: float = 3.0, interval: float = 0.05) -> bool:
+        """
+        Wait until the interface is up (or down), or the timeout expires
+        
+        Re-checks on each NotifyIpInterfaceChange callback instead of
+        polling; if registration fails, polls every `interval` seconds.
+        An interface missing from net_if_stats() counts as down.
+        
+        Returns:
+            True if the wanted state was reached
+        """
+        changed = threading.Event()
+        callback = _IF_CHANGE_CALLBACK(lambda context, row, kind: changed.set())
+        handle = wintypes.HANDLE()
+        registered = _iphlpapi.NotifyIpInterfaceChange(
+            AF_UNSPEC, callback, None, False, ctypes.byref(handle)
+        ) == 0
+        # Notifications can miss link-state-only changes; keep a slow re-check
+        wait = 0.5 if registered else interval
+        
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                changed.clear()
+                stats = psutil.net_if_stats().get(self.interface)
+                if (stats is not None and stats.isup) == want_up:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                changed.wait(min(wait, remaining))
+        finally:
+            if registered:
+                _iphlpapi.CancelMibChangeNotify2(handle)
+    
     def _disable_interface(self) -> bool:
         """Disable the network interface"""
         try:
-            result = subprocess.run(
-                ['netsh', 'interface', 'set', 'interface', self.interface, 'disable'],
-                capture_output=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            time.sleep(1)
-            return result.returncode == 0
+            ok = self._has_powershell() and ps_host.run(
+                f"Disable-NetAdapter -Name {ps_host.quote(self.interface)} -Confirm:$false"
+            )[0]
+            if not ok:
+                result = subprocess.run(
+                    ['netsh', 'interface', 'set', 'interface', self.interface, 'disable'],
+                    capture_output=True,
+                    creationflags=subprocess.CREATE_NO_WINDOW
+                )
+                if result.returncode != 0:
+                    return False
+            self._wait_iface_state(want_up=False)
+            return True
         except Exception:
             return False
     
     def _enable_interface(self) -> bool:
         """Enable the network interface"""
         try:
-            result = subprocess.run(
-                ['netsh', 'interface', 'set', 'interface', self.interface, 'enable'],
-                capture_output=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
+            ok = self._has_powershell() and ps_host.run(
+                f"Enable-NetAdapter -Name {ps_host.quote(self.interface)} -Confirm:$false"
+            )[0]
+            if not ok:
+                result = subprocess.run(
+                    ['netsh', 'interface', 'set', 'interface', self.interface, 'enable'],
+                    capture_output=True,
+                    creationflags=subprocess.CREATE_NO_WINDOW
+                )
+                if result.returncode != 0:
+                    return False
+            self._wait_iface_state(want_up=True)
+            return True
+        except Exception:
+            return False
+    
+    @classmethod
+    def _has_powershell(cls) -> bool:
+        """Check (once) whether PowerShell is available"""
+        if cls._powershell_available is None:
+            cls._powershell_available = shutil.which('powershell') is not None
+        return cls._powershell_available
+    
+    def _set_mac_powershell(self, mac: str) -> bool:
+        """Set MAC and restart the adapter with a single PowerShell command"""
+        mac_clean = mac.replace(':', '').replace('-', '')
+        name = ps_host.quote(self.interface)
+        
+        try:
+            ok, _ = ps_host.run(
+                f"Set-NetAdapter -Name {name} -MacAddress '{mac_clean}' -Confirm:$false; "
+                f"Restart-NetAdapter -Name {name} -Confirm:$false"
             )
-            time.sleep(2)  # Wait for interface to come up
-            return result.returncode == 0
+            if not ok:
+                return False
+            self._wait_iface_state(want_up=True)
+            return True
         except Exception:
             return False
     
@@ -198,27 +367,25 @@ class MACChanger:
             self.original_mac = self.get_current_mac()
         
         # Validate MAC format
-        if not re.match(r'^([0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}$', new_mac):
+        if not _MAC_VALIDATE_RE.match(new_mac):
             return False, "Invalid MAC address format"
         
-        # Disable interface
-        print(f"Disabling interface {self.interface}...")
-        if not self._disable_interface():
-            return False, "Failed to disable interface"
-        
-        # Set new MAC in registry
         print(f"Setting new MAC: {new_mac}")
-        if not self._set_mac_registry(new_mac):
-            self._enable_interface()
-            return False, "Failed to set MAC in registry"
-        
-        # Re-enable interface
-        print(f"Re-enabling interface {self.interface}...")
-        if not self._enable_interface():
-            return False, "Failed to re-enable interface"
+        if not (self._has_powershell() and self._set_mac_powershell(new_mac)):
+            # Fall back to netsh + registry
+            print(f"Disabling interface {self.interface}...")
+            if not self._disable_interface():
+                return False, "Failed to disable interface"
+            
+            if not self._set_mac_registry(new_mac):
+                self._enable_interface()
+                return False, "Failed to set MAC in registry"
+            
+            print(f"Re-enabling interface {self.interface}...")
+            if not self._enable_interface():
+                return False, "Failed to re-enable interface"
         
         # Verify change
-        time.sleep(2)
         current = self.get_current_mac()
         new_mac_normalized = new_mac.upper().replace('-', ':')
         
@@ -242,7 +409,6 @@ class MACChanger:
         # Re-enable interface
         self._enable_interface()
         
-        time.sleep(2)
         current = self.get_current_mac()
         
         return True, f"MAC restored. Current MAC: {current}"
@@ -304,8 +470,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
     
     if args.list_profiles:
-        profiles = DeviceProfiles()
-        print(json.dumps([p.to_dict() for p in profiles.get_all()], indent=2))
+        print(json.dumps([p.to_dict() for p in get_all_profiles()], indent=2))
         sys.exit(0)
     
     changer = MACChanger(args.interface)
@@ -323,8 +488,7 @@ if __name__ == "__main__":
         print(json.dumps({"success": success, "message": msg}))
     
     elif args.profile:
-        profiles = DeviceProfiles()
-        profile = profiles.get_by_id(args.profile)
+        profile = get_profile_by_id(args.profile)
         if profile:
             success, msg = changer.apply_profile(profile)
             print(json.dumps({"success": success, "message": msg, "profile": profile.to_dict()}))
@@ -0,0 +1,159 @@
+"""
+Persistent PowerShell host
+Keeps one powershell.exe running and feeds it commands over stdin, so
+repeated adapter operations don't each pay PowerShell start-up
+"""
+
+import atexit
+import queue
+import shutil
+import subprocess
+import threading
+from typing import Optional, Tuple
+
+
+# Marks the end of a command's output; followed by True/False
+_SENTINEL = "__PS_HOST_END__"
+
+
+def quote(value: str) -> str:
+    """Quote a string as a PowerShell single-quoted literal"""
+    return "'" + value.replace("'", "''") + "'"
+
+
+class PowerShellHost:
+    """
+    A single long-lived `powershell -Command -` process
+    
+    Commands are written one per line, each followed by a sentinel line
+    carrying the command's success flag; output is read up to the sentinel.
+    """
+    
+    def __init__(self):
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+    
+    def _start(self) -> bool:
+        """Start the PowerShell process and its stdout reader"""
+        if self._proc and self._proc.poll() is None:
+            return True
+        
+        if not shutil.which('powershell'):
+            return False
+        
+        try:
+            self._proc = subprocess.Popen(
+                ['powershell', '-NoProfile', '-NoLogo', '-NonInteractive', '-Command', '-'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                bufsize=1,
+                creationflags=subprocess.CREATE_NO_WINDOW
+            )
+        except OSError:
+            self._proc = None
+            return False
+        
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=self._read_loop,
+            args=(self._proc.stdout, self._lines),
+            daemon=True,
+            name="PowerShellHostReader"
+        ).start()
+        return True
+    
+    @staticmethod
+    def _read_loop(stdout, lines: queue.Queue):
+        """Forward stdout lines to the queue; None marks EOF"""
+        for line in stdout:
+            lines.put(line.rstrip('\r\n'))
+        lines.put(None)
+    
+    def run(self, command: str, timeout: float = 30.0) -> Tuple[bool, str]:
+        """
+        Run a single-line PowerShell command
+        
+        Args:
+            command: Command text (no newlines)
+            timeout: Seconds to wait for the command to finish
+        
+        Returns:
+            Tuple of (success, output)
+        """
+        with self._lock:
+            if not self._start():
+                return False, "PowerShell is not available"
+            
+            script = (
+                f"try {{ $ErrorActionPreference = 'Stop'; {command}; $__ok = $? }} "
+                f"catch {{ $__ok = $false; Write-Output $_.Exception.Message }}; "
+                f"Write-Output \"{_SENTINEL}$__ok\"\n"
+            )
+            try:
+                self._proc.stdin.write(script)
+                self._proc.stdin.flush()
+            except OSError as e:
+                self._kill()
+                return False, str(e)
+            
+            output = []
+            try:
+                while True:
+                    line = self._lines.get(timeout=timeout)
+                    if line is None:
+                        self._kill()
+                        return False, "\n".join(output)
+                    if line.startswith(_SENTINEL):
+                        return line[len(_SENTINEL):] == "True", "\n".join(output)
+                    output.append(line)
+            except queue.Empty:
+                # Hung command: restart the host on next use
+                self._kill()
+                return False, f"Timed out after {timeout}s"
+    
+    def _kill(self):
+        """Terminate the PowerShell process"""
+        if self._proc:
+            try:
+                self._proc.kill()
+            except OSError:
+                pass
+            self._proc = None
+    
+    def close(self):
+        """Ask PowerShell to exit, killing it if it doesn't"""
+        with self._lock:
+            if not self._proc:
+                return
+            try:
+                self._proc.stdin.write("exit\n")
+                self._proc.stdin.flush()
+                self._proc.wait(timeout=2)
+                self._proc = None
+            except (OSError, subprocess.TimeoutExpired):
+                self._kill()
+
+
+_host: Optional[PowerShellHost] = None
+_host_lock = threading.Lock()
+
+
+def get_host() -> PowerShellHost:
+    """Get the shared PowerShell host (started on first command)"""
+    global _host
+    if _host is None:
+        with _host_lock:
+            if _host is None:
+                _host = PowerShellHost()
+                atexit.register(_host.close)
+    return _host
+
+
+def run(command: str, timeout: float = 30.0) -> Tuple[bool, str]:
+    """Run a command on the shared PowerShell host"""
+    return get_host().run(command, timeout)
@@ -2,14 +2,44 @@
 Configuration management for Network Monitor
 """
 
+import copy
+import functools
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
+
+def _loads(data: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(value: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# Parsed config files keyed by path: ((st_mtime_ns, st_size), data)
+_SETTINGS_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+@functools.cache
 def get_config_path() -> Path:
-    """Get the configuration directory path"""
+    """
+    Get the configuration directory path
+    
+    Resolved once per process; call get_config_path.cache_clear() after
+    changing NETWORK_MONITOR_CONFIG.
+    """
     # Check for environment variable override
     if os.environ.get("NETWORK_MONITOR_CONFIG"):
         return Path(os.environ["NETWORK_MONITOR_CONFIG"])
@@ -18,27 +48,49 @@ def get_config_path() -> Path:
     return Path(__file__).parent.parent.parent / "config"
 
 
-def load_config(filename: str) -> Dict[str, Any]:
+def _read_config(filename: str) -> Dict[str, Any]:
     """
-    Load configuration from JSON file
+    Load a config file through the cache
     
-    Args:
-        filename: Name of config file (e.g., 'settings.json')
-        
-    Returns:
-        Configuration dictionary
+    The file is only re-parsed when its mtime or size changes. The returned
+    dict is shared with the cache and must not be modified.
     """
     config_path = get_config_path() / filename
+    key = str(config_path)
     
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except OSError:
+        _SETTINGS_CACHE.pop(key, None)
         return {}
+    stamp = (st.st_mtime_ns, st.st_size)
+    
+    cached = _SETTINGS_CACHE.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(config_path, 'rb') as f:
+            data = _loads(f.read())
     except (json.JSONDecodeError, IOError) as e:
         print(f"Error loading config {filename}: {e}")
         return {}
+    
+    _SETTINGS_CACHE[key] = (stamp, data)
+    return data
+
+
+def load_config(filename: str) -> Dict[str, Any]:
+    """
+    Load configuration from JSON file
+    
+    Args:
+        filename: Name of config file (e.g., 'settings.json')
+        
+    Returns:
+        Configuration dictionary
+    """
+    return copy.deepcopy(_read_config(filename))
 
 
 def save_config(filename: str, config: Dict[str, Any]) -> bool:
@@ -56,8 +108,12 @@ def save_config(filename: str, config: Dict[str, Any]) -> bool:
     config_path.parent.mkdir(parents=True, exist_ok=True)
     
     try:
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        with open(config_path, 'wb') as f:
+            f.write(_dumps(config))
+        st = config_path.stat()
+        _SETTINGS_CACHE[str(config_path)] = (
+            (st.st_mtime_ns, st.st_size), copy.deepcopy(config)
+        )
         return True
     except IOError as e:
         print(f"Error saving config {filename}: {e}")
@@ -66,7 +122,7 @@ def save_config(filename: str, config: Dict[str, Any]) -> bool:
 
 def get_setting(key: str, default: Any = None) -> Any:
     """Get a specific setting from settings.json"""
-    settings = load_config("settings.json")
+    settings = _read_config("settings.json")
     
     # Support nested keys with dot notation
     keys = key.split('.')
@@ -78,6 +134,9 @@ def get_setting(key: str, default: Any = None) -> Any:
         else:
             return default
     
+    # Don't hand out the cached containers
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
     return value
 
 
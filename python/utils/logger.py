@@ -2,26 +2,59 @@
 Logging configuration for Network Monitor
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
 from pathlib import Path
+from typing import Dict
+
+
+# Records never use %(thread)/%(process)/%(processName); skip collecting them
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Caller lookup (a stack walk per record) is only needed for verbose file
+# records; setup_logger(verbose=True) turns it back on
+_SRCFILE = logging._srcfile
+logging._srcfile = None
+
+# Background listeners doing the actual console/file writes, per logger name
+_LISTENERS: Dict[str, logging.handlers.QueueListener] = {}
+
+
+def _stop_listeners():
+    """Flush and stop all queue listeners"""
+    while _LISTENERS:
+        _, listener = _LISTENERS.popitem()
+        listener.stop()
+
+
+atexit.register(_stop_listeners)
 
 
 def setup_logger(
     name: str = "network_monitor",
     level: int = logging.INFO,
     log_to_file: bool = True,
-    log_dir: str = "./logs"
+    log_dir: str = "./logs",
+    verbose: bool = False
 ) -> logging.Logger:
     """
     Setup and configure logger
     
+    Records are handed to a QueueHandler; a QueueListener thread does the
+    console and file writes.
+    
     Args:
         name: Logger name
         level: Logging level
         log_to_file: Whether to log to file
         log_dir: Directory for log files
+        verbose: Include filename:lineno in file records
         
     Returns:
         Configured logger instance
@@ -30,7 +63,11 @@ def setup_logger(
     logger.setLevel(level)
     
     # Clear existing handlers
+    listener = _LISTENERS.pop(name, None)
+    if listener:
+        listener.stop()
     logger.handlers.clear()
+    handlers = []
     
     # Console handler
     console_handler = logging.StreamHandler()
@@ -40,7 +77,7 @@ def setup_logger(
         datefmt='%H:%M:%S'
     )
     console_handler.setFormatter(console_format)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler
     if log_to_file:
@@ -48,13 +85,27 @@ def setup_logger(
         log_path.mkdir(parents=True, exist_ok=True)
         
         log_file = log_path / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
         file_handler.setLevel(level)
-        file_format = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
-        )
+        if verbose:
+            logging._srcfile = _SRCFILE
+            file_format = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+            )
+        else:
+            file_format = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
         file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    _LISTENERS[name] = listener
     
     return logger
 
@@ -2,13 +2,449 @@
 Network utility functions for Network Monitor
 """
 
+import ctypes
+import functools
+import ipaddress
 import socket
 import subprocess
 import re
-from typing import Optional, List, Dict, Tuple
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Tuple, Iterator
 import psutil
 
 
+_GW_IP_RE = re.compile(r'Default Gateway[^\n]*?(\d+\.\d+\.\d+\.\d+)')
+# `arp -a` rows: "  <ip>   <mac>   <type>"
+_MAC_ARP_RE = re.compile(
+    r'^\s*(?P<ip>\d+\.\d+\.\d+\.\d+)\s+(?P<mac>([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2})',
+    re.MULTILINE
+)
+
+
+# Short-lived interface snapshots: (value, time.monotonic() when taken)
+_ADDRS_CACHE: Tuple[Optional[dict], float] = (None, 0.0)
+_STATS_CACHE: Tuple[Optional[dict], float] = (None, 0.0)
+_GATEWAY_CACHE: Tuple[Optional[str], float] = (None, 0.0)
+
+
+def _cached_addrs(ttl: float = 0.5) -> Dict[str, Tuple[str, str, str]]:
+    """
+    Interface address table, reused for up to `ttl` seconds
+    
+    Returns:
+        {name: (ipv4, mac, netmask)}; missing values are ""
+    """
+    global _ADDRS_CACHE
+    addrs, ts = _ADDRS_CACHE
+    now = time.monotonic()
+    if addrs is None or now - ts >= ttl:
+        addrs = _win_get_addrs()
+        if addrs is None:
+            addrs = _psutil_get_addrs()
+        _ADDRS_CACHE = (addrs, now)
+    return addrs
+
+
+def _cached_stats(ttl: float = 0.5) -> dict:
+    """psutil.net_if_stats(), reused for up to `ttl` seconds"""
+    global _STATS_CACHE
+    stats, ts = _STATS_CACHE
+    now = time.monotonic()
+    if stats is None or now - ts >= ttl:
+        stats = psutil.net_if_stats()
+        _STATS_CACHE = (stats, now)
+    return stats
+
+
+def refresh_interfaces():
+    """Drop the cached interface snapshots so the next call re-reads them"""
+    global _ADDRS_CACHE, _STATS_CACHE, _GATEWAY_CACHE
+    _ADDRS_CACHE = (None, 0.0)
+    _STATS_CACHE = (None, 0.0)
+    _GATEWAY_CACHE = (None, 0.0)
+
+
+def _psutil_get_addrs() -> Dict[str, Tuple[str, str, str]]:
+    """Build the interface address table from psutil.net_if_addrs()"""
+    af_inet = socket.AF_INET
+    af_link = psutil.AF_LINK
+    table = {}
+    for iface_name, addr_list in psutil.net_if_addrs().items():
+        ip = mac = netmask = ""
+        for addr in addr_list:
+            family = addr.family
+            if family == af_inet:
+                if not ip:
+                    ip = addr.address
+                    netmask = addr.netmask or ""
+            elif family == af_link:
+                mac = addr.address
+        table[iface_name] = (ip, mac, netmask)
+    return table
+
+
+# --- Windows IP Helper (iphlpapi) bindings ---------------------------------
+
+if sys.platform == "win32":
+    _iphlpapi = ctypes.WinDLL("iphlpapi")
+    _iphlpapi.IcmpCreateFile.restype = ctypes.c_void_p
+    _iphlpapi.IcmpCloseHandle.argtypes = [ctypes.c_void_p]
+    _iphlpapi.IcmpSendEcho.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ushort,
+        ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong
+    ]
+    _iphlpapi.IcmpSendEcho.restype = ctypes.c_ulong
+else:
+    _iphlpapi = None
+
+AF_UNSPEC = 0
+ERROR_SUCCESS = 0
+ERROR_BUFFER_OVERFLOW = 111
+MAX_ADAPTER_ADDRESS_LENGTH = 8
+IF_MAX_PHYS_ADDRESS_LENGTH = 32
+
+GAA_FLAG_SKIP_ANYCAST = 0x0002
+GAA_FLAG_SKIP_MULTICAST = 0x0004
+GAA_FLAG_SKIP_DNS_SERVER = 0x0008
+GAA_FLAG_SKIP_DNS_INFO = 0x0800
+
+# Only unicast addresses, friendly names and MACs are read
+_GAA_FAST_FLAGS = (
+    GAA_FLAG_SKIP_ANYCAST | GAA_FLAG_SKIP_MULTICAST |
+    GAA_FLAG_SKIP_DNS_SERVER | GAA_FLAG_SKIP_DNS_INFO
+)
+
+# Buffer size that last satisfied GetAdaptersAddresses
+_gaa_buf_size = 15 * 1024
+
+
+class SOCKADDR_IN(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_ushort),
+        ("sin_addr", ctypes.c_ubyte * 4),
+        ("sin_zero", ctypes.c_char * 8),
+    ]
+
+
+class SOCKADDR_IN6(ctypes.Structure):
+    _fields_ = [
+        ("sin6_family", ctypes.c_ushort),
+        ("sin6_port", ctypes.c_ushort),
+        ("sin6_flowinfo", ctypes.c_ulong),
+        ("sin6_addr", ctypes.c_ubyte * 16),
+        ("sin6_scope_id", ctypes.c_ulong),
+    ]
+
+
+class SOCKADDR_INET(ctypes.Union):
+    _fields_ = [
+        ("Ipv4", SOCKADDR_IN),
+        ("Ipv6", SOCKADDR_IN6),
+        ("si_family", ctypes.c_ushort),
+    ]
+
+
+class MIB_IPNET_ROW2(ctypes.Structure):
+    _fields_ = [
+        ("Address", SOCKADDR_INET),
+        ("InterfaceIndex", ctypes.c_ulong),
+        ("InterfaceLuid", ctypes.c_uint64),
+        ("PhysicalAddress", ctypes.c_ubyte * IF_MAX_PHYS_ADDRESS_LENGTH),
+        ("PhysicalAddressLength", ctypes.c_ulong),
+        ("State", ctypes.c_int),
+        ("Flags", ctypes.c_ubyte),
+        ("ReachabilityTime", ctypes.c_ulong),
+    ]
+
+
+class MIB_IPNET_TABLE2(ctypes.Structure):
+    _fields_ = [
+        ("NumEntries", ctypes.c_ulong),
+        ("Table", MIB_IPNET_ROW2 * 1),
+    ]
+
+
+class IP_ADDRESS_PREFIX(ctypes.Structure):
+    _fields_ = [
+        ("Prefix", SOCKADDR_INET),
+        ("PrefixLength", ctypes.c_ubyte),
+    ]
+
+
+class MIB_IPFORWARD_ROW2(ctypes.Structure):
+    _fields_ = [
+        ("InterfaceLuid", ctypes.c_uint64),
+        ("InterfaceIndex", ctypes.c_ulong),
+        ("DestinationPrefix", IP_ADDRESS_PREFIX),
+        ("NextHop", SOCKADDR_INET),
+        ("SitePrefixLength", ctypes.c_ubyte),
+        ("ValidLifetime", ctypes.c_ulong),
+        ("PreferredLifetime", ctypes.c_ulong),
+        ("Metric", ctypes.c_ulong),
+        ("Protocol", ctypes.c_int),
+        ("Loopback", ctypes.c_ubyte),
+        ("AutoconfigureAddress", ctypes.c_ubyte),
+        ("Publish", ctypes.c_ubyte),
+        ("Immortal", ctypes.c_ubyte),
+        ("Age", ctypes.c_ulong),
+        ("Origin", ctypes.c_int),
+    ]
+
+
+class MIB_IPFORWARD_TABLE2(ctypes.Structure):
+    _fields_ = [
+        ("NumEntries", ctypes.c_ulong),
+        ("Table", MIB_IPFORWARD_ROW2 * 1),
+    ]
+
+
+class IP_OPTION_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ("Ttl", ctypes.c_ubyte),
+        ("Tos", ctypes.c_ubyte),
+        ("Flags", ctypes.c_ubyte),
+        ("OptionsSize", ctypes.c_ubyte),
+        ("OptionsData", ctypes.c_void_p),
+    ]
+
+
+class ICMP_ECHO_REPLY(ctypes.Structure):
+    _fields_ = [
+        ("Address", ctypes.c_ulong),
+        ("Status", ctypes.c_ulong),
+        ("RoundTripTime", ctypes.c_ulong),
+        ("DataSize", ctypes.c_ushort),
+        ("Reserved", ctypes.c_ushort),
+        ("Data", ctypes.c_void_p),
+        ("Options", IP_OPTION_INFORMATION),
+    ]
+
+
+class SOCKET_ADDRESS(ctypes.Structure):
+    _fields_ = [
+        ("lpSockaddr", ctypes.POINTER(SOCKADDR_IN)),
+        ("iSockaddrLength", ctypes.c_int),
+    ]
+
+
+class IP_ADAPTER_UNICAST_ADDRESS(ctypes.Structure):
+    pass
+
+
+IP_ADAPTER_UNICAST_ADDRESS._fields_ = [
+    ("Length", ctypes.c_ulong),
+    ("Flags", ctypes.c_ulong),
+    ("Next", ctypes.POINTER(IP_ADAPTER_UNICAST_ADDRESS)),
+    ("Address", SOCKET_ADDRESS),
+    ("PrefixOrigin", ctypes.c_int),
+    ("SuffixOrigin", ctypes.c_int),
+    ("DadState", ctypes.c_int),
+    ("ValidLifetime", ctypes.c_ulong),
+    ("PreferredLifetime", ctypes.c_ulong),
+    ("LeaseLifetime", ctypes.c_ulong),
+    ("OnLinkPrefixLength", ctypes.c_ubyte),
+]
+
+
+class IP_ADAPTER_ADDRESSES(ctypes.Structure):
+    """Leading fields of IP_ADAPTER_ADDRESSES_LH (only these are read)"""
+    pass
+
+
+IP_ADAPTER_ADDRESSES._fields_ = [
+    ("Length", ctypes.c_ulong),
+    ("IfIndex", ctypes.c_ulong),
+    ("Next", ctypes.POINTER(IP_ADAPTER_ADDRESSES)),
+    ("AdapterName", ctypes.c_char_p),
+    ("FirstUnicastAddress", ctypes.POINTER(IP_ADAPTER_UNICAST_ADDRESS)),
+    ("FirstAnycastAddress", ctypes.c_void_p),
+    ("FirstMulticastAddress", ctypes.c_void_p),
+    ("FirstDnsServerAddress", ctypes.c_void_p),
+    ("DnsSuffix", ctypes.c_wchar_p),
+    ("Description", ctypes.c_wchar_p),
+    ("FriendlyName", ctypes.c_wchar_p),
+    ("PhysicalAddress", ctypes.c_ubyte * MAX_ADAPTER_ADDRESS_LENGTH),
+    ("PhysicalAddressLength", ctypes.c_ulong),
+    ("Flags", ctypes.c_ulong),
+    ("Mtu", ctypes.c_ulong),
+    ("IfType", ctypes.c_ulong),
+    ("OperStatus", ctypes.c_int),
+]
+
+
+def _iter_adapters(family: int = AF_UNSPEC, flags: int = 0) -> Iterator[IP_ADAPTER_ADDRESSES]:
+    """
+    Walk the adapter list returned by GetAdaptersAddresses
+    
+    Yields nothing on non-Windows platforms or if the call fails.
+    """
+    global _gaa_buf_size
+    if _iphlpapi is None:
+        return
+    
+    size = ctypes.c_ulong(_gaa_buf_size)
+    for _ in range(3):
+        buf = ctypes.create_string_buffer(size.value)
+        ret = _iphlpapi.GetAdaptersAddresses(family, flags, None, buf, ctypes.byref(size))
+        if ret != ERROR_BUFFER_OVERFLOW:
+            break
+    if ret != ERROR_SUCCESS:
+        return
+    _gaa_buf_size = len(buf)
+    
+    adapter = ctypes.cast(buf, ctypes.POINTER(IP_ADAPTER_ADDRESSES))
+    while adapter:
+        yield adapter.contents
+        adapter = adapter.contents.Next
+
+
+def _prefix_to_netmask(prefix_len: int) -> str:
+    """Convert a prefix length (e.g. 24) to a dotted netmask"""
+    mask = (0xFFFFFFFF << (32 - prefix_len)) & 0xFFFFFFFF if prefix_len else 0
+    return socket.inet_ntoa(mask.to_bytes(4, "big"))
+
+
+def _win_get_addrs() -> Optional[Dict[str, Tuple[str, str, str]]]:
+    """
+    Build the interface address table straight from GetAdaptersAddresses
+    
+    Skips the DNS, anycast and multicast data that psutil collects but
+    this module never reads.
+    
+    Returns:
+        {name: (ipv4, mac, netmask)}, or None when not on Windows
+    """
+    if _iphlpapi is None:
+        return None
+    
+    table = {}
+    for adapter in _iter_adapters(socket.AF_INET, _GAA_FAST_FLAGS):
+        ip = netmask = ""
+        unicast = adapter.FirstUnicastAddress
+        if unicast:
+            addr = unicast.contents
+            ip = socket.inet_ntoa(bytes(addr.Address.lpSockaddr.contents.sin_addr))
+            netmask = _prefix_to_netmask(addr.OnLinkPrefixLength)
+        
+        # Same "AA-BB-CC-DD-EE-FF" form psutil reports on Windows
+        mac = '-'.join(
+            '%02X' % b for b in adapter.PhysicalAddress[:adapter.PhysicalAddressLength]
+        )
+        table[adapter.FriendlyName] = (ip, mac, netmask)
+    return table
+
+
+def _win_arp_lookup(ip: str) -> Optional[str]:
+    """
+    Look up an IPv4 neighbor's MAC with GetIpNetTable2
+    
+    Returns:
+        MAC as "aa:bb:cc:dd:ee:ff", "" if there is no usable entry,
+        or None when the table cannot be read
+    """
+    if _iphlpapi is None:
+        return None
+    
+    table = ctypes.POINTER(MIB_IPNET_TABLE2)()
+    if _iphlpapi.GetIpNetTable2(socket.AF_INET, ctypes.byref(table)) != ERROR_SUCCESS:
+        return None
+    
+    try:
+        target = socket.inet_aton(ip)
+        count = table.contents.NumEntries
+        rows = ctypes.cast(
+            ctypes.addressof(table.contents.Table),
+            ctypes.POINTER(MIB_IPNET_ROW2 * count)
+        ).contents
+        for row in rows:
+            if bytes(row.Address.Ipv4.sin_addr) != target:
+                continue
+            mac = bytes(row.PhysicalAddress[:row.PhysicalAddressLength])
+            if len(mac) == 6 and any(mac):
+                return ':'.join('%02x' % b for b in mac)
+        return ""
+    finally:
+        _iphlpapi.FreeMibTable(table)
+
+
+def _win_default_gateway() -> Optional[str]:
+    """
+    Find the IPv4 default route's next hop with GetIpForwardTable2
+    
+    Returns:
+        Gateway IP, "" if there is no default route, or None when the
+        table cannot be read
+    """
+    if _iphlpapi is None:
+        return None
+    
+    table = ctypes.POINTER(MIB_IPFORWARD_TABLE2)()
+    if _iphlpapi.GetIpForwardTable2(socket.AF_INET, ctypes.byref(table)) != ERROR_SUCCESS:
+        return None
+    
+    try:
+        count = table.contents.NumEntries
+        rows = ctypes.cast(
+            ctypes.addressof(table.contents.Table),
+            ctypes.POINTER(MIB_IPFORWARD_ROW2 * count)
+        ).contents
+        best = None
+        for row in rows:
+            if row.DestinationPrefix.PrefixLength != 0:
+                continue
+            next_hop = bytes(row.NextHop.Ipv4.sin_addr)
+            if not any(next_hop):
+                continue
+            if best is None or row.Metric < best[0]:
+                best = (row.Metric, next_hop)
+        return socket.inet_ntoa(best[1]) if best else ""
+    finally:
+        _iphlpapi.FreeMibTable(table)
+
+
+_ICMP_PAYLOAD = b"network-monitor"
+
+
+def _win_ping(ip: str, timeout_ms: int) -> bool:
+    """Send one ICMP echo with IcmpSendEcho"""
+    handle = _iphlpapi.IcmpCreateFile()
+    if not handle or handle == ctypes.c_void_p(-1).value:
+        raise OSError("IcmpCreateFile failed")
+    
+    try:
+        reply = ctypes.create_string_buffer(
+            ctypes.sizeof(ICMP_ECHO_REPLY) + len(_ICMP_PAYLOAD) + 8
+        )
+        # IPAddr holds the address bytes in network order
+        dest = int.from_bytes(socket.inet_aton(ip), sys.byteorder)
+        count = _iphlpapi.IcmpSendEcho(
+            handle, dest, _ICMP_PAYLOAD, len(_ICMP_PAYLOAD),
+            None, reply, len(reply), timeout_ms
+        )
+        return count > 0 and ICMP_ECHO_REPLY.from_buffer(reply).Status == 0
+    finally:
+        _iphlpapi.IcmpCloseHandle(handle)
+
+
+def get_adapter_guid(interface: str) -> Optional[str]:
+    """
+    Get the adapter GUID (NetCfgInstanceId) for an interface's friendly name
+    
+    Args:
+        interface: Interface name as shown by psutil (e.g., "Wi-Fi")
+        
+    Returns:
+        GUID string like "{...}" or None
+    """
+    for adapter in _iter_adapters(AF_UNSPEC, _GAA_FAST_FLAGS):
+        if adapter.FriendlyName == interface:
+            return adapter.AdapterName.decode("ascii")
+    return None
+
+
 def get_interfaces() -> List[Dict[str, str]]:
     """
     Get list of network interfaces with their details
@@ -17,29 +453,21 @@ def get_interfaces() -> List[Dict[str, str]]:
         List of interface dictionaries with name, ip, mac, description
     """
     interfaces = []
-    addrs = psutil.net_if_addrs()
-    stats = psutil.net_if_stats()
+    stats = _cached_stats()
     
-    for iface_name, addr_list in addrs.items():
-        if iface_name in stats and stats[iface_name].isup:
-            ip = ""
-            mac = ""
-            
-            for addr in addr_list:
-                if addr.family.name == 'AF_INET':
-                    ip = addr.address
-                elif addr.family.name == 'AF_LINK':
-                    mac = addr.address
-            
-            # Skip loopback and interfaces without IP
-            if ip and not ip.startswith('127.'):
-                interfaces.append({
-                    "name": iface_name,
-                    "ip": ip,
-                    "mac": mac,
-                    "is_up": stats[iface_name].isup,
-                    "speed": stats[iface_name].speed
-                })
+    for iface_name, (ip, mac, _) in _cached_addrs().items():
+        # Skip loopback and interfaces without IP
+        if not ip or ip.startswith('127.'):
+            continue
+        st = stats.get(iface_name)
+        if st is not None and st.isup:
+            interfaces.append({
+                "name": iface_name,
+                "ip": ip,
+                "mac": mac,
+                "is_up": True,
+                "speed": st.speed
+            })
     
     return interfaces
 
@@ -55,11 +483,9 @@ def get_local_ip(interface: Optional[str] = None) -> Optional[str]:
         Local IP address or None
     """
     if interface:
-        addrs = psutil.net_if_addrs()
-        if interface in addrs:
-            for addr in addrs[interface]:
-                if addr.family.name == 'AF_INET':
-                    return addr.address
+        entry = _cached_addrs().get(interface)
+        if entry and entry[0]:
+            return entry[0]
         return None
     
     # Auto-detect by connecting to external address
@@ -83,54 +509,56 @@ def get_mac_address(interface: Optional[str] = None) -> Optional[str]:
     Returns:
         MAC address or None
     """
-    addrs = psutil.net_if_addrs()
+    addrs = _cached_addrs()
     
-    if interface and interface in addrs:
-        for addr in addrs[interface]:
-            if addr.family.name == 'AF_LINK':
-                return addr.address
+    if interface and interface in addrs and addrs[interface][1]:
+        return addrs[interface][1]
     
     # Return first non-empty MAC
-    for iface_name, addr_list in addrs.items():
-        for addr in addr_list:
-            if addr.family.name == 'AF_LINK' and addr.address:
-                return addr.address
+    for _, mac, _ in addrs.values():
+        if mac:
+            return mac
     
     return None
 
 
 def get_gateway_ip() -> Optional[str]:
     """
-    Get default gateway IP address
+    Get default gateway IP address (cached for 1 second)
     
     Returns:
         Gateway IP or None
     """
+    global _GATEWAY_CACHE
+    gateway, ts = _GATEWAY_CACHE
+    now = time.monotonic()
+    if gateway is not None and now - ts < 1.0:
+        return gateway or None
+    
     try:
-        # Windows: parse ipconfig output
-        result = subprocess.run(
-            ['ipconfig'],
-            capture_output=True,
-            text=True,
-            creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
-        )
-        
-        for line in result.stdout.split('\n'):
-            if 'Default Gateway' in line:
-                match = re.search(r'(\d+\.\d+\.\d+\.\d+)', line)
-                if match:
-                    return match.group(1)
+        gateway = _win_default_gateway()
     except Exception:
-        pass
+        gateway = None
     
-    # Fallback: try common gateway addresses
-    local_ip = get_local_ip()
-    if local_ip:
-        parts = local_ip.split('.')
-        parts[3] = '1'
-        return '.'.join(parts)
+    if gateway is None:
+        # Fallback: parse ipconfig output
+        gateway = ""
+        try:
+            result = subprocess.run(
+                ['ipconfig'],
+                capture_output=True,
+                text=True,
+                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+            )
+            
+            match = _GW_IP_RE.search(result.stdout)
+            if match:
+                gateway = match.group(1)
+        except Exception:
+            pass
     
-    return None
+    _GATEWAY_CACHE = (gateway, now)
+    return gateway or None
 
 
 def get_gateway_mac(gateway_ip: Optional[str] = None) -> Optional[str]:
@@ -149,6 +577,14 @@ def get_gateway_mac(gateway_ip: Optional[str] = None) -> Optional[str]:
     if not gateway_ip:
         return None
     
+    try:
+        mac = _win_arp_lookup(gateway_ip)
+        if mac is not None:
+            return mac or None
+    except Exception:
+        pass
+    
+    # Fallback: parse `arp -a`
     try:
         result = subprocess.run(
             ['arp', '-a'],
@@ -157,12 +593,9 @@ def get_gateway_mac(gateway_ip: Optional[str] = None) -> Optional[str]:
             creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
         )
         
-        for line in result.stdout.split('\n'):
-            if gateway_ip in line:
-                # Match MAC address pattern
-                match = re.search(r'([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}', line)
-                if match:
-                    return match.group(0).replace('-', ':').lower()
+        for match in _MAC_ARP_RE.finditer(result.stdout):
+            if match.group('ip') == gateway_ip:
+                return match.group('mac').replace('-', ':').lower()
     except Exception:
         pass
     
@@ -171,19 +604,15 @@ def get_gateway_mac(gateway_ip: Optional[str] = None) -> Optional[str]:
 
 def get_subnet_mask(interface: Optional[str] = None) -> Optional[str]:
     """Get subnet mask for interface"""
-    addrs = psutil.net_if_addrs()
+    addrs = _cached_addrs()
     
     if interface and interface in addrs:
-        for addr in addrs[interface]:
-            if addr.family.name == 'AF_INET':
-                return addr.netmask
+        return addrs[interface][2] or None
     
     # Return first valid netmask
-    for iface_name, addr_list in addrs.items():
-        for addr in addr_list:
-            if addr.family.name == 'AF_INET' and addr.netmask:
-                if not addr.address.startswith('127.'):
-                    return addr.netmask
+    for ip, _, netmask in addrs.values():
+        if netmask and not ip.startswith('127.'):
+            return netmask
     
     return None
 
@@ -199,14 +628,22 @@ def get_network_range(interface: Optional[str] = None) -> str:
     if not ip:
         return "192.168.1.0/24"
     
-    # Simple /24 assumption for home networks
-    parts = ip.split('.')
-    parts[3] = '0'
-    return '.'.join(parts) + '/24'
+    # Netmask of the interface that owns the IP
+    netmask = None
+    for iface_ip, _, iface_mask in _cached_addrs().values():
+        if iface_ip == ip:
+            netmask = iface_mask
+            break
+    
+    try:
+        return str(ipaddress.ip_interface(f"{ip}/{netmask or 24}").network)
+    except ValueError:
+        return str(ipaddress.ip_interface(f"{ip}/24").network)
 
 
+@functools.cache
 def is_admin() -> bool:
-    """Check if running with administrator privileges"""
+    """Check if running with administrator privileges (checked once)"""
     try:
         import ctypes
         return ctypes.windll.shell32.IsUserAnAdmin() != 0
@@ -216,6 +653,12 @@ def is_admin() -> bool:
 
 def ping(host: str, timeout: int = 1) -> bool:
     """Check if host is reachable"""
+    if _iphlpapi is not None:
+        try:
+            return _win_ping(socket.gethostbyname(host), int(timeout * 1000))
+        except OSError:
+            return False
+    
     try:
         result = subprocess.run(
             ['ping', '-n', '1', '-w', str(timeout * 1000), host],
@@ -227,6 +670,21 @@ def ping(host: str, timeout: int = 1) -> bool:
         return False
 
 
+def ping_many(hosts: List[str], timeout: int = 1, max_workers: int = 32) -> Dict[str, bool]:
+    """
+    Ping several hosts concurrently
+    
+    Returns:
+        {host: reachable}
+    """
+    if not hosts:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(hosts))) as pool:
+        results = pool.map(lambda host: ping(host, timeout), hosts)
+        return dict(zip(hosts, results))
+
+
 def output_json(data: dict) -> None:
     """Output data as JSON to stdout for Tauri IPC."""
     import json